@@ -1,16 +1,224 @@
 """CLI interface for MCP Security Profiler."""
 
+import asyncio
+import os
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
 import click
-from github import GithubException
 
 from mcp_security_profiler.config import Config
-from mcp_security_profiler.github_handler import GitHubHandler
-from mcp_security_profiler.scanner import Scanner
-from mcp_security_profiler.reporters import generate_reports
+
+# GitHub, git and scanner modules are imported inside the commands that need
+# them, so `--help` and `config` do not pay for PyGithub/GitPython imports
+if TYPE_CHECKING:
+    from mcp_security_profiler.github_handler import GitHubHandler
+
+
+# Cap parallel clone jobs to avoid GitHub abuse throttling
+MAX_CLONE_JOBS = 8
+
+
+def _echo_rate_limit_wait(delay: float) -> None:
+    """Tell the user that GitHub API calls are paused until the rate limit resets."""
+    click.secho(
+        f"GitHub API rate limit nearly exhausted, waiting {delay:.0f}s for the reset...",
+        fg="yellow",
+        err=True
+    )
+
+
+def _load_handler() -> "GitHubHandler":
+    """Create a GitHub handler from the configured token, exiting if none is set."""
+    from mcp_security_profiler.github_handler import GitHubHandler
+    
+    config_manager = Config()
+    
+    if not config_manager.is_configured():
+        click.secho(
+            "Error: GitHub token not configured. Run 'mcp-security-profiler config' first.",
+            fg="red",
+            err=True
+        )
+        sys.exit(1)
+    
+    return GitHubHandler(config_manager.get_token(), on_rate_limit_wait=_echo_rate_limit_wait)
+
+
+async def _prepare_scan(
+    handler: "GitHubHandler",
+    owner: str,
+    repo_name: str,
+    clone_jobs: int
+) -> list:
+    """
+    Fetch repository info, clone the repository and warm up the scanner concurrently.
+    
+    The clone follows the remote HEAD, which is the default branch, so it
+    does not need to wait for the repository info.
+    
+    Returns:
+        List of [repo_info, repo_path, None]; failed steps hold their exception
+    """
+    from mcp_security_profiler.scanner import Scanner
+    
+    def _warn(message: str) -> None:
+        click.secho(f"Warning: {owner}/{repo_name}: {message}", fg="yellow", err=True)
+    
+    return await asyncio.gather(
+        asyncio.to_thread(handler.get_repo_info, owner, repo_name),
+        asyncio.to_thread(handler.clone_repository, owner, repo_name, jobs=clone_jobs, on_warning=_warn),
+        asyncio.to_thread(Scanner.warm_up),
+        return_exceptions=True
+    )
+
+
+async def _scan_one(
+    handler: "GitHubHandler",
+    repository: str,
+    formats: list[str],
+    output_dir: Path,
+    clone_jobs: int,
+    force_rescan: bool = False,
+    verbose: bool = False
+) -> tuple[Dict[str, Any], Dict[str, Path]]:
+    """
+    Clone, scan and report on a single repository.
+    
+    Args:
+        handler: Shared GitHub handler
+        repository: Repository URL or owner/repo
+        formats: Report formats to generate
+        output_dir: Output directory for reports
+        clone_jobs: Number of submodules to fetch in parallel
+        force_rescan: Run the MCP agent even if a cached result exists
+        verbose: Echo each step and the repository details
+    
+    Returns:
+        Tuple of (scan summary, report files by format)
+    
+    Raises:
+        Exception: If any step of the scan fails
+    """
+    from mcp_security_profiler.reporters import generate_reports
+    from mcp_security_profiler.scanner import Scanner
+    
+    def _echo(message: str, **kwargs: Any) -> None:
+        if verbose:
+            click.echo(message, **kwargs)
+    
+    owner, repo_name = handler.parse_repo_url(repository)
+    _echo(f"📦 Repository: {owner}/{repo_name}")
+    
+    # Fetch repository info and clone concurrently
+    _echo("Fetching repository information and cloning...", nl=False)
+    repo_info, repo_path, _ = await _prepare_scan(handler, owner, repo_name, clone_jobs)
+    
+    if isinstance(repo_info, Exception) or isinstance(repo_path, Exception):
+        _echo(" ❌")
+        if isinstance(repo_path, Path):
+            await asyncio.to_thread(handler.cleanup_repo, repo_path)
+        raise repo_info if isinstance(repo_info, Exception) else repo_path
+    
+    _echo(" ✓")
+    _echo(f"   Description: {repo_info.get('description', 'N/A')}")
+    _echo(f"   Language: {repo_info.get('language', 'N/A')}")
+    _echo(f"   Stars: {repo_info.get('stars', 0)}")
+    _echo(f"   Cloned to: {repo_path}")
+    
+    try:
+        _echo("\n🔍 Starting security scan...")
+        scanner = Scanner(repo_path, repo_info)
+        scan_results = await asyncio.to_thread(scanner.scan, force_rescan)
+        _echo("✓ Scan completed")
+        
+        _echo("\n📝 Generating reports...")
+        report_files = await asyncio.to_thread(generate_reports, scan_results, output_dir, formats)
+        return scan_results.get("summary", {}), report_files
+    finally:
+        _echo("\n🧹 Cleaning up...")
+        await asyncio.to_thread(handler.cleanup_repo, repo_path)
+        _echo("✓ Cleanup completed")
+
+
+async def _bulk_scan(
+    handler: "GitHubHandler",
+    repositories: list[str],
+    formats: list[str],
+    output_dir: Path,
+    clone_jobs: int,
+    max_concurrency: int,
+    force_rescan: bool = False
+) -> list:
+    """
+    Scan many repositories concurrently, at most max_concurrency at a time.
+    
+    Returns:
+        List of _scan_one results in input order; failed scans hold their exception
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def one(repository: str) -> tuple[Dict[str, Any], Dict[str, Path]]:
+        async with semaphore:
+            click.echo(f"🔍 Scanning {repository}...")
+            return await _scan_one(handler, repository, formats, output_dir, clone_jobs, force_rescan)
+    
+    return await asyncio.gather(
+        *(one(repository) for repository in repositories),
+        return_exceptions=True
+    )
+
+
+def _error_message(error: Exception) -> str:
+    """Get the message to show for a failed scan, unwrapping GitHub API errors."""
+    from github import GithubException
+    
+    if isinstance(error, GithubException) and isinstance(error.data, dict):
+        return error.data.get("message", str(error))
+    return str(error)
+
+
+# Options shared by scan and bulk-scan
+_SCAN_OPTIONS = [
+    click.option(
+        "--format",
+        "-f",
+        "formats",
+        multiple=True,
+        type=click.Choice(["json", "markdown"], case_sensitive=False),
+        default=["json", "markdown"],
+        help="Report format(s) to generate (can specify multiple)"
+    ),
+    click.option(
+        "--output-dir",
+        "-o",
+        type=click.Path(path_type=Path),
+        default=Path("./scan-results"),
+        help="Output directory for reports"
+    ),
+    click.option(
+        "--clone-jobs",
+        "-j",
+        type=click.IntRange(1, MAX_CLONE_JOBS),
+        default=min(os.cpu_count() or 1, MAX_CLONE_JOBS),
+        show_default=True,
+        help="Number of submodules to fetch in parallel when cloning"
+    ),
+    click.option(
+        "--force-rescan",
+        is_flag=True,
+        help="Run the MCP agent even if this commit was already scanned"
+    ),
+]
+
+
+def _scan_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    """Apply the options shared by scan and bulk-scan, in declaration order."""
+    for option in reversed(_SCAN_OPTIONS):
+        command = option(command)
+    return command
 
 
 @click.group()
@@ -30,47 +238,43 @@ def cli():
 )
 def config(token: str):
     """Configure GitHub token for API access."""
-    config_manager = Config()
-    
-    # Validate token
-    click.echo("Validating token...", nl=False)
-    handler = GitHubHandler(token)
+    from mcp_security_profiler.github_handler import GitHubHandler
     
-    if not handler.validate_token():
-        click.echo(" ❌")
-        click.secho("Error: Invalid GitHub token", fg="red", err=True)
-        sys.exit(1)
+    config_manager = Config()
     
-    click.echo(" ✓")
+    # Validate token, unless this token was validated recently
+    login = None
+    if config_manager.is_token_fresh(token):
+        click.echo("Token validated recently, skipping validation ✓")
+    else:
+        click.echo("Validating token...", nl=False)
+        handler = GitHubHandler(token)
+        login = handler.get_login()
+        
+        if login is None:
+            click.echo(" ❌")
+            click.secho("Error: Invalid GitHub token", fg="red", err=True)
+            sys.exit(1)
+        
+        click.echo(" ✓")
     
     # Save token
     config_manager.save_token(token)
+    if login is not None:
+        config_manager.save_token_meta(token, login, time.time())
     click.secho("✓ GitHub token configured successfully!", fg="green")
     click.echo(f"Configuration saved to: {config_manager.config_file}")
 
 
 @cli.command()
 @click.argument("repository")
-@click.option(
-    "--format",
-    "-f",
-    "formats",
-    multiple=True,
-    type=click.Choice(["json", "markdown"], case_sensitive=False),
-    default=["json", "markdown"],
-    help="Report format(s) to generate (can specify multiple)"
-)
-@click.option(
-    "--output-dir",
-    "-o",
-    type=click.Path(path_type=Path),
-    default=Path("./scan-results"),
-    help="Output directory for reports"
-)
+@_scan_options
 def scan(
     repository: str,
     formats: tuple[str, ...],
-    output_dir: Path
+    output_dir: Path,
+    clone_jobs: int,
+    force_rescan: bool
 ):
     """
     Scan a GitHub repository for security issues.
@@ -79,106 +283,101 @@ def scan(
     - Full URL: https://github.com/owner/repo
     - Short format: owner/repo
     """
-    # Load config
-    config_manager = Config()
+    handler = _load_handler()
     
-    if not config_manager.is_configured():
-        click.secho(
-            "Error: GitHub token not configured. Run 'mcp-security-profiler config' first.",
-            fg="red",
-            err=True
+    try:
+        summary, report_files = asyncio.run(
+            _scan_one(
+                handler, repository, list(formats), output_dir, clone_jobs, force_rescan, verbose=True
+            )
         )
+    except Exception as e:
+        click.secho(f"Error: {_error_message(e)}", fg="red", err=True)
         sys.exit(1)
     
-    token = config_manager.get_token()
-    handler = GitHubHandler(token)
+    # Display summary
+    click.echo(f"\n📊 Scan Summary:")
+    click.echo(f"   Total findings: {summary.get('total_findings', 0)}")
     
-    # Parse repository
-    try:
-        owner, repo_name = handler.parse_repo_url(repository)
-        click.echo(f"📦 Repository: {owner}/{repo_name}")
-    except ValueError as e:
-        click.secho(f"Error: {e}", fg="red", err=True)
-        sys.exit(1)
+    if summary.get("critical", 0) > 0:
+        click.secho(f"   Critical: {summary['critical']}", fg="red", bold=True)
+    if summary.get("high", 0) > 0:
+        click.secho(f"   High: {summary['high']}", fg="red")
+    if summary.get("medium", 0) > 0:
+        click.secho(f"   Medium: {summary['medium']}", fg="yellow")
+    if summary.get("low", 0) > 0:
+        click.secho(f"   Low: {summary['low']}", fg="blue")
+    if summary.get("info", 0) > 0:
+        click.echo(f"   Info: {summary['info']}")
     
-    # Get repository info
-    try:
-        click.echo("Fetching repository information...", nl=False)
-        repo_info = handler.get_repo_info(owner, repo_name)
-        click.echo(" ✓")
-        
-        click.echo(f"   Description: {repo_info.get('description', 'N/A')}")
-        click.echo(f"   Language: {repo_info.get('language', 'N/A')}")
-        click.echo(f"   Stars: {repo_info.get('stars', 0)}")
-    except GithubException as e:
-        click.echo(" ❌")
-        click.secho(f"Error: {e.data.get('message', str(e))}", fg="red", err=True)
-        sys.exit(1)
+    click.echo("\n✓ Reports generated:")
+    for fmt, path in report_files.items():
+        click.echo(f"   {fmt.upper()}: {path}")
     
-    # Clone repository
-    repo_path = None
-    try:
-        click.echo("Cloning repository...", nl=False)
-        repo_path = handler.clone_repository(repository)
-        click.echo(" ✓")
-        click.echo(f"   Cloned to: {repo_path}")
-    except Exception as e:
-        click.echo(" ❌")
-        click.secho(f"Error cloning repository: {e}", fg="red", err=True)
-        sys.exit(1)
+    click.secho("\n✨ Scan complete!", fg="green", bold=True)
+
+
+@cli.command("bulk-scan")
+@click.argument("repos_file", type=click.File("r"))
+@_scan_options
+@click.option(
+    "--max-concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=4,
+    envvar="MCP_MAX_CONCURRENCY",
+    show_default=True,
+    help="Maximum number of repositories scanned at once"
+)
+def bulk_scan(
+    repos_file,
+    formats: tuple[str, ...],
+    output_dir: Path,
+    clone_jobs: int,
+    max_concurrency: int,
+    force_rescan: bool
+):
+    """
+    Scan many GitHub repositories concurrently.
     
-    # Scan repository
-    try:
-        click.echo("\n🔍 Starting security scan...")
-        scanner = Scanner(repo_path, repo_info)
-        scan_results = scanner.scan()
-        
-        click.echo("✓ Scan completed")
-        
-        # Display summary
-        summary = scan_results.get("summary", {})
-        click.echo(f"\n📊 Scan Summary:")
-        click.echo(f"   Total findings: {summary.get('total_findings', 0)}")
-        
-        if summary.get("critical", 0) > 0:
-            click.secho(f"   Critical: {summary['critical']}", fg="red", bold=True)
-        if summary.get("high", 0) > 0:
-            click.secho(f"   High: {summary['high']}", fg="red")
-        if summary.get("medium", 0) > 0:
-            click.secho(f"   Medium: {summary['medium']}", fg="yellow")
-        if summary.get("low", 0) > 0:
-            click.secho(f"   Low: {summary['low']}", fg="blue")
-        if summary.get("info", 0) > 0:
-            click.echo(f"   Info: {summary['info']}")
-        
-    except Exception as e:
-        click.secho(f"Error during scan: {e}", fg="red", err=True)
-        if repo_path:
-            handler.cleanup_repo(repo_path)
+    REPOS_FILE lists one repository per line (URL or owner/repo).
+    Blank lines and lines starting with '#' are ignored.
+    """
+    repositories = [
+        line.strip() for line in repos_file
+        if line.strip() and not line.strip().startswith("#")
+    ]
+    if not repositories:
+        click.secho("Error: No repositories listed", fg="red", err=True)
         sys.exit(1)
     
-    # Generate reports
-    try:
-        click.echo(f"\n📝 Generating reports...")
-        report_files = generate_reports(scan_results, output_dir, list(formats))
+    handler = _load_handler()
+    
+    click.echo(f"📦 Scanning {len(repositories)} repositories ({max_concurrency} at a time)\n")
+    results = asyncio.run(
+        _bulk_scan(
+            handler, repositories, list(formats), output_dir, clone_jobs, max_concurrency, force_rescan
+        )
+    )
+    
+    click.echo("\n📊 Bulk Scan Summary:")
+    failed = 0
+    for repository, result in zip(repositories, results):
+        if isinstance(result, Exception):
+            failed += 1
+            click.secho(f"   ❌ {repository}: {_error_message(result)}", fg="red")
+            continue
         
-        click.echo("✓ Reports generated:")
+        summary, report_files = result
+        click.echo(f"   ✓ {repository}: {summary.get('total_findings', 0)} findings")
         for fmt, path in report_files.items():
-            click.echo(f"   {fmt.upper()}: {path}")
+            click.echo(f"      {fmt.upper()}: {path}")
     
-    except Exception as e:
-        click.secho(f"Error generating reports: {e}", fg="red", err=True)
-        if repo_path:
-            handler.cleanup_repo(repo_path)
+    if failed:
+        click.secho(f"\n{failed} of {len(repositories)} scans failed", fg="red", bold=True)
         sys.exit(1)
     
-    # Cleanup
-    if repo_path:
-        click.echo("\n🧹 Cleaning up...")
-        handler.cleanup_repo(repo_path)
-        click.echo("✓ Cleanup completed")
-    
-    click.secho("\n✨ Scan complete!", fg="green", bold=True)
+    click.secho("\n✨ Bulk scan complete!", fg="green", bold=True)
 
 
 def main():
@@ -1,21 +1,54 @@
 """Configuration management for MCP Security Profiler."""
 
+import hashlib
 import json
 import os
+import tempfile
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 
+def _hash_token(token: str) -> str:
+    """Hash a token so it can be compared without being stored twice."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+@lru_cache(maxsize=8)
+def _read_config(path: Path, mtime_ns: int) -> dict:
+    """
+    Read and parse a config file.
+    
+    Cached on the file's modification time so unchanged files are parsed once.
+    
+    Args:
+        path: Path to config file
+        mtime_ns: Modification time of the file in nanoseconds
+    
+    Returns:
+        Parsed config data
+    """
+    try:
+        return json.loads(path.read_bytes())
+    except (json.JSONDecodeError, UnicodeDecodeError, IOError):
+        return {}
+
+
 class Config:
     """Manages configuration for the security profiler."""
     
     CONFIG_DIR = Path.home() / ".mcp-security-profiler"
     CONFIG_FILE = CONFIG_DIR / "config.json"
+    HTTP_CACHE_DIR = CONFIG_DIR / "http-cache"
+    STATS_DIR = CONFIG_DIR / "stats"
+    MCP_CACHE_DIR = CONFIG_DIR / "mcp-cache"
     
     def __init__(self):
         """Initialize config manager."""
         self.config_dir = self.CONFIG_DIR
         self.config_file = self.CONFIG_FILE
+        self._cache: dict | None = None
         self._ensure_config_dir()
     
     def _ensure_config_dir(self) -> None:
@@ -43,24 +76,69 @@ class Config:
         config_data = self._load_config()
         return config_data.get("github_token")
     
+    def save_token_meta(self, token: str, login: str, validated_at: float) -> None:
+        """
+        Record a successful token validation.
+        
+        Only a SHA-256 digest of the token is stored, so rotating the token
+        invalidates the record.
+        
+        Args:
+            token: GitHub personal access token that was validated
+            login: GitHub login the token belongs to
+            validated_at: Validation time as a Unix timestamp
+        """
+        config_data = self._load_config()
+        config_data["token_meta"] = {
+            "token_sha256": _hash_token(token),
+            "login": login,
+            "validated_at": validated_at,
+        }
+        self._save_config(config_data)
+    
+    def is_token_fresh(self, token: str, ttl: float = 86400) -> bool:
+        """
+        Check whether a token was validated within the TTL.
+        
+        Args:
+            token: GitHub personal access token
+            ttl: Maximum age of the validation in seconds
+        
+        Returns:
+            True if the same token was validated less than ttl seconds ago
+        """
+        meta = self._load_config().get("token_meta") or {}
+        return (
+            meta.get("token_sha256") == _hash_token(token)
+            and time.time() - meta.get("validated_at", 0) < ttl
+        )
+    
     def _load_config(self) -> dict:
-        """Load config from file."""
-        if not self.config_file.exists():
-            return {}
+        """Load config from file, reading from disk only on first use."""
+        if self._cache is None:
+            try:
+                mtime_ns = self.config_file.stat().st_mtime_ns
+            except OSError:
+                return {}
+            self._cache = _read_config(self.config_file, mtime_ns)
         
-        try:
-            with open(self.config_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
+        return dict(self._cache)
     
     def _save_config(self, config_data: dict) -> None:
         """Save config to file."""
-        with open(self.config_file, "w") as f:
-            json.dump(config_data, f, indent=2)
-        
-        # Set restrictive permissions (owner read/write only)
-        os.chmod(self.config_file, 0o600)
+        # Write-then-rename so a crash never leaves a truncated config
+        fd, tmp_path = tempfile.mkstemp(dir=self.config_dir, prefix=".config-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(config_data, f, separators=(",", ":"))
+            
+            # Set restrictive permissions (owner read/write only)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.config_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._cache = None
     
     def is_configured(self) -> bool:
         """Check if GitHub token is configured."""
@@ -1,25 +1,380 @@
 """GitHub API handler for repository operations."""
 
+import base64
+import json
+import errno
+import os
+import re
 import tempfile
 import shutil
+import stat
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
-from github import Github, GithubException, Auth
+from typing import Optional, Dict, Any, Callable, Iterator, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from github import Github, GithubException, RateLimitExceededException, Auth
 import git
 
+from mcp_security_profiler.config import Config
+
+
+T = TypeVar("T")
+
+# Never prompt for credentials, and abort transfers slower than 1 KB/s for 60s
+# instead of hanging until the TCP timeout
+GIT_CLONE_ENV = {
+    "GIT_TERMINAL_PROMPT": "0",
+    "GIT_HTTP_LOW_SPEED_LIMIT": "1000",
+    "GIT_HTTP_LOW_SPEED_TIME": "60",
+}
+
+# Transport tuning for clones: multiplex requests over a single HTTP/2
+# connection where the server supports it
+GIT_CLONE_CONFIG = {
+    "http.version": "HTTP/2",
+}
+
+# Cached clones are evicted least recently used first above this total size
+REPO_CACHE_MAX_BYTES = 5 * 1024 ** 3
+
+# RAM-backed clone target, enabled with MCP_CLONE_TMPFS=1
+TMPFS_DIR = Path("/dev/shm")
+
+_SHA_RE = re.compile(r"[0-9a-f]{40}")
+
+_REPO_URL_RE = re.compile(
+    r"^(?:git@github\.com:|https?://github\.com/)?"
+    r"(?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?/?$"
+)
+
+
+def _remove_readonly(func: Callable[..., Any], path: str, exc: BaseException) -> None:
+    """Clear the read-only bit git sets on object files and retry the removal."""
+    try:
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+    except OSError:
+        pass
+
+
+def _tmpfs_enabled() -> bool:
+    """Check whether clones should be placed on tmpfs."""
+    return os.getenv("MCP_CLONE_TMPFS") == "1" and TMPFS_DIR.is_dir()
+
+
+def _is_out_of_space(error: Exception) -> bool:
+    """Check whether a clone failed because the target filesystem is full."""
+    if isinstance(error, OSError):
+        return error.errno == errno.ENOSPC
+    return "No space left on device" in str(getattr(error, "stderr", ""))
+
+
+def _git_clone_env(token: Optional[str] = None) -> Dict[str, str]:
+    """
+    Build the environment for git clone commands.
+    
+    GIT_CLONE_CONFIG is passed as GIT_CONFIG_KEY_n/GIT_CONFIG_VALUE_n
+    variables rather than -c options, so it applies to every git command
+    run with this environment. Entries already configured this way in the
+    environment are kept.
+    
+    The token is sent as an HTTP header for github.com rather than embedded
+    in the clone URL, so it never ends up in the clone's .git/config (git
+    resolves relative submodule URLs against the origin URL).
+    
+    Args:
+        token: GitHub token authenticating requests to github.com
+    
+    Returns:
+        Environment variables for git
+    """
+    config = dict(GIT_CLONE_CONFIG)
+    if token:
+        credentials = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+        config["http.https://github.com/.extraheader"] = f"Authorization: Basic {credentials}"
+    
+    env = {**os.environ, **GIT_CLONE_ENV}
+    offset = int(env.get("GIT_CONFIG_COUNT") or 0)
+    for index, (key, value) in enumerate(config.items(), offset):
+        env[f"GIT_CONFIG_KEY_{index}"] = key
+        env[f"GIT_CONFIG_VALUE_{index}"] = value
+    env["GIT_CONFIG_COUNT"] = str(offset + len(config))
+    return env
+
+
+def _git_clone_fast(
+    clone_url: str,
+    target: Path,
+    multi_options: list[str],
+    token: Optional[str] = None
+) -> None:
+    """
+    Clone with the git CLI directly as a blobless partial clone.
+    
+    Blobs are fetched on demand, so only files in the checked-out tree are
+    transferred.
+    
+    Args:
+        clone_url: Clone URL, without credentials
+        target: Target directory for cloning
+        multi_options: Extra options passed to git clone
+        token: GitHub token authenticating the clone
+    
+    Raises:
+        git.GitCommandError: If git exits with an error
+        OSError: If the git executable cannot be run
+    """
+    command = [
+        git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git",
+        "clone",
+        "--filter=blob:none",
+        *multi_options,
+        clone_url,
+        str(target),
+    ]
+    result = subprocess.run(
+        command,
+        capture_output=True,
+        encoding="utf-8",
+        errors="replace",
+        env=_git_clone_env(token),
+    )
+    if result.returncode != 0:
+        raise git.GitCommandError(command, result.returncode, result.stderr)
+
+
+def _update_submodules(repo_path: Path, jobs: int, token: Optional[str] = None) -> list[str]:
+    """
+    Fetch the submodules of a clone, shallowly and in parallel.
+    
+    Best effort: submodules that cannot be fetched (private, SSH-only or
+    deleted) are left empty instead of failing the clone.
+    
+    Args:
+        repo_path: Cloned repository
+        jobs: Number of submodules fetched in parallel
+        token: GitHub token authenticating submodules hosted on github.com
+    
+    Returns:
+        Descriptions of the submodules that could not be fetched
+    """
+    if not (repo_path / ".gitmodules").is_file():
+        return []
+    
+    env = _git_clone_env(token)
+    # Fail instead of prompting for SSH host keys or passphrases
+    env.setdefault("GIT_SSH_COMMAND", "ssh -o BatchMode=yes")
+    
+    def _git(*args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git", "-C", str(repo_path), *args],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            env=env,
+        )
+    
+    update = ["submodule", "update", "--init", "--recursive", "--depth=1"]
+    failures = []
+    try:
+        if _git(*update, f"--jobs={jobs}").returncode == 0:
+            return failures
+        
+        # One failed submodule aborts the whole update and can leave others
+        # fetched but not checked out; retry them one by one, forcing checkout
+        result = _git("config", "-z", "-f", ".gitmodules", "--get-regexp", r"^submodule\..*\.path$")
+        paths = [record.partition("\n")[2] for record in result.stdout.split("\0") if record]
+        for path in paths:
+            result = _git(*update, "--force", "--", path)
+            if result.returncode != 0:
+                # The first fatal line names the cause; later ones only report the abort
+                lines = result.stderr.strip().splitlines()
+                reason = next(
+                    (line for line in lines if line.startswith("fatal:")),
+                    lines[-1] if lines else f"git exited with {result.returncode}"
+                )
+                failures.append(f"Could not fetch submodule {path}: {reason}")
+    except OSError as e:
+        failures.append(f"Could not fetch submodules: {e}")
+    
+    return failures
+
+
+def _repo_cache_enabled() -> bool:
+    """Check whether clones should go through the local repository cache."""
+    return os.getenv("MCP_REPO_CACHE", "1") != "0"
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink a file, copying it when linking is not possible (e.g. across filesystems)."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _dir_size(path: Path) -> int:
+    """Total size in bytes of the files under a directory, not following symlinks."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _size_file(cache_dir: Path) -> Path:
+    """Get the file recording the size of a cached clone."""
+    return cache_dir.with_name(f"{cache_dir.name}.size")
+
+
+def _incomplete_file(cache_dir: Path) -> Path:
+    """Get the marker of a cached clone whose submodules could not all be fetched."""
+    return cache_dir.with_name(f"{cache_dir.name}.incomplete")
+
+
+def _cached_clone_size(cache_dir: Path) -> int:
+    """Size in bytes of a cached clone, as recorded when it was stored."""
+    try:
+        return int(_size_file(cache_dir).read_text())
+    except (OSError, ValueError):
+        # Entry from before sizes were recorded; measure it once
+        size = _dir_size(cache_dir)
+        if cache_dir.is_dir():
+            try:
+                _size_file(cache_dir).write_text(str(size))
+            except OSError:
+                pass
+        return size
+
+
+class RateLimiter:
+    """Paces GitHub API calls to stay clear of primary and secondary rate limits."""
+    
+    def __init__(
+        self,
+        client: Github,
+        threshold: int = 10,
+        max_retries: int = 3,
+        max_wait: float = 300,
+        on_wait: Optional[Callable[[float], None]] = None
+    ):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            client: GitHub client whose last response headers are inspected
+            threshold: Remaining requests below which calls wait for the reset
+            max_retries: Maximum retries after a rate-limited response
+            max_wait: Longest wait in seconds for the reset before giving up
+            on_wait: Called with the delay in seconds before waiting for the reset
+        """
+        self.client = client
+        self.threshold = threshold
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.on_wait = on_wait
+        self._lock = threading.Lock()
+    
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Call a GitHub API function, waiting and retrying around rate limits.
+        
+        Args:
+            func: Function performing the API call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            Return value of func
+        
+        Raises:
+            GithubException: If the call fails or retries are exhausted
+        """
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_budget()
+            try:
+                return func(*args, **kwargs)
+            except GithubException as e:
+                if attempt == self.max_retries or not self._is_rate_limited(e):
+                    raise
+                time.sleep(self._retry_delay(e, attempt))
+    
+    def _wait_for_budget(self) -> None:
+        """
+        Sleep until the rate limit resets if the last response left too few requests.
+        
+        Raises:
+            RateLimitExceededException: If the reset is more than max_wait seconds away
+        """
+        with self._lock:
+            # X-RateLimit-Remaining / X-RateLimit-Reset of the last response
+            remaining, _ = self.client.requester.rate_limiting
+            reset_at = self.client.requester.rate_limiting_resettime
+            if 0 <= remaining < self.threshold:
+                delay = reset_at - time.time()
+                if delay > self.max_wait:
+                    reset_time = datetime.fromtimestamp(reset_at).strftime("%H:%M:%S")
+                    raise RateLimitExceededException(
+                        403,
+                        {"message": f"GitHub API rate limit exhausted, resets at {reset_time}"}
+                    )
+                if delay > 0:
+                    if self.on_wait is not None:
+                        self.on_wait(delay)
+                    # Held under the lock so other workers wait for the same reset
+                    time.sleep(delay)
+    
+    @staticmethod
+    def _is_rate_limited(error: GithubException) -> bool:
+        """Check whether an API error is a primary or secondary rate limit."""
+        if error.status not in (403, 429):
+            return False
+        headers = error.headers or {}
+        return "retry-after" in headers or headers.get("x-ratelimit-remaining") == "0"
+    
+    @staticmethod
+    def _retry_delay(error: GithubException, attempt: int) -> float:
+        """Seconds to wait before retrying, honoring Retry-After."""
+        headers = error.headers or {}
+        try:
+            retry_after = float(headers.get("retry-after", 0))
+        except ValueError:
+            retry_after = 0
+        return max(retry_after, 2 ** attempt)
+
 
 class GitHubHandler:
     """Handles GitHub API operations and repository cloning."""
     
-    def __init__(self, token: str):
+    # Clones keyed by commit: <owner>/<repo>@<sha>
+    _cache_root = Config.CONFIG_DIR / "repo-cache"
+    
+    def __init__(self, token: str, on_rate_limit_wait: Optional[Callable[[float], None]] = None):
         """
         Initialize GitHub handler.
         
         Args:
             token: GitHub personal access token
+            on_rate_limit_wait: Called with the delay in seconds before waiting for a rate limit reset
         """
         auth = Auth.Token(token)
-        self.client = Github(auth=auth)
+        # RateLimiter is the only retry policy; PyGithub's default GithubRetry
+        # would retry and sleep underneath each of its attempts
+        self.client = Github(auth=auth, retry=None)
+        self.rate_limiter = RateLimiter(self.client, on_wait=on_rate_limit_wait)
         self.token = token
     
     def validate_token(self) -> bool:
@@ -29,11 +384,19 @@ class GitHubHandler:
         Returns:
             True if token is valid, False otherwise
         """
+        return self.get_login() is not None
+    
+    def get_login(self) -> Optional[str]:
+        """
+        Get the login of the token's user.
+        
+        Returns:
+            GitHub login, or None if the token is invalid
+        """
         try:
-            self.client.get_user().login
-            return True
+            return self.rate_limiter.call(lambda: self.client.get_user().login)
         except GithubException:
-            return False
+            return None
     
     def parse_repo_url(self, repo_url: str) -> tuple[str, str]:
         """
@@ -55,26 +418,14 @@ class GitHubHandler:
         # owner/repo
         
         repo_url = repo_url.strip()
-        
-        if repo_url.startswith("git@github.com:"):
-            repo_url = repo_url.replace("git@github.com:", "")
-        elif repo_url.startswith("https://github.com/"):
-            repo_url = repo_url.replace("https://github.com/", "")
-        elif repo_url.startswith("http://github.com/"):
-            repo_url = repo_url.replace("http://github.com/", "")
-        
-        # Remove .git suffix if present
-        if repo_url.endswith(".git"):
-            repo_url = repo_url[:-4]
-        
-        parts = repo_url.split("/")
-        if len(parts) != 2:
+        match = _REPO_URL_RE.match(repo_url)
+        if not match:
             raise ValueError(
                 f"Invalid repository URL format: {repo_url}. "
                 "Expected format: owner/repo or https://github.com/owner/repo"
             )
         
-        return parts[0], parts[1]
+        return match.group("owner"), match.group("repo")
     
     def get_repo_info(self, owner: str, repo_name: str) -> Dict[str, Any]:
         """
@@ -90,32 +441,133 @@ class GitHubHandler:
         Raises:
             GithubException: If repository not found or access denied
         """
+        key = f"{owner}/{repo_name}"
+        cached = self._load_http_cache(owner, repo_name)
+        
+        # Conditional request: GitHub answers 304 without charging the rate limit
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        def _fetch() -> tuple[int, Dict[str, Any], str]:
+            status, response_headers, body = self.client.requester.requestJson(
+                "GET", f"/repos/{key}", headers=headers
+            )
+            if status >= 400:
+                try:
+                    data = json.loads(body) if body else {}
+                except ValueError:
+                    # Proxies and outages can answer with HTML or plain text
+                    data = {"message": body}
+                raise GithubException(status=status, data=data, headers=response_headers)
+            return status, response_headers, body
+        
         try:
-            repo = self.client.get_repo(f"{owner}/{repo_name}")
-            return {
-                "full_name": repo.full_name,
-                "description": repo.description,
-                "stars": repo.stargazers_count,
-                "forks": repo.forks_count,
-                "language": repo.language,
-                "created_at": repo.created_at.isoformat() if repo.created_at else None,
-                "updated_at": repo.updated_at.isoformat() if repo.updated_at else None,
-                "default_branch": repo.default_branch,
-                "clone_url": repo.clone_url,
-            }
+            status, response_headers, body = self.rate_limiter.call(_fetch)
+            if status == 304 and cached:
+                return cached["info"]
+            
+            data = json.loads(body) if body else {}
+            info = self._format_repo_info(data)
         except GithubException as e:
             raise GithubException(
                 status=e.status,
                 data={"message": f"Failed to access repository: {e.data.get('message', str(e))}"}
             )
+        
+        self._save_http_cache(owner, repo_name, {
+            "etag": response_headers.get("etag"),
+            "last_modified": response_headers.get("last-modified"),
+            "info": info,
+        })
+        
+        return info
+    
+    @staticmethod
+    def _format_repo_info(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the repository information dictionary from a REST API response.
+        
+        Args:
+            data: Parsed JSON body of ``GET /repos/{owner}/{repo}``
+        
+        Returns:
+            Dictionary with repository information
+        """
+        def _isoformat(value: Optional[str]) -> Optional[str]:
+            return datetime.fromisoformat(value).isoformat() if value else None
+        
+        return {
+            "full_name": data.get("full_name"),
+            "description": data.get("description"),
+            "stars": data.get("stargazers_count"),
+            "forks": data.get("forks_count"),
+            "language": data.get("language"),
+            "created_at": _isoformat(data.get("created_at")),
+            "updated_at": _isoformat(data.get("updated_at")),
+            "default_branch": data.get("default_branch"),
+            "clone_url": data.get("clone_url"),
+        }
+    
+    @staticmethod
+    def _http_cache_file(owner: str, repo_name: str) -> Path:
+        """Get the cached REST response file of a repository."""
+        return Config.HTTP_CACHE_DIR / owner / f"{repo_name}.json"
+    
+    def _load_http_cache(self, owner: str, repo_name: str) -> Optional[Dict[str, Any]]:
+        """Load the cached REST response of a repository from disk."""
+        try:
+            with open(self._http_cache_file(owner, repo_name), "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
+    
+    def _save_http_cache(self, owner: str, repo_name: str, entry: Dict[str, Any]) -> None:
+        """
+        Persist the REST response of a repository to disk.
+        
+        Each repository has its own file, so concurrent scans of different
+        repositories never overwrite each other's entries.
+        """
+        cache_file = self._http_cache_file(owner, repo_name)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent scans never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=f".{repo_name}-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, cache_file)
+        except OSError:
+            # The cache is an optimization; never fail a scan over it
+            pass
     
-    def clone_repository(self, repo_url: str, target_dir: Optional[Path] = None) -> Path:
+    def clone_repository(
+        self,
+        owner: str,
+        repo_name: str,
+        target_dir: Optional[Path] = None,
+        branch: Optional[str] = None,
+        jobs: int = 1,
+        on_warning: Optional[Callable[[str], None]] = None
+    ) -> Path:
         """
         Clone a GitHub repository.
         
+        Only the tip commit of a single branch is fetched (shallow clone),
+        since the scanner only inspects the working tree at HEAD. Clones are
+        cached per commit, so re-scanning an unchanged repository skips the
+        network entirely (disable with MCP_REPO_CACHE=0).
+        
         Args:
-            repo_url: GitHub repository URL
+            owner: Repository owner
+            repo_name: Repository name
             target_dir: Target directory for cloning (temp dir if None)
+            branch: Branch to clone (remote HEAD if None)
+            jobs: Number of submodules fetched in parallel
+            on_warning: Called with a message for each submodule that could not be fetched
         
         Returns:
             Path to cloned repository
@@ -123,21 +575,365 @@ class GitHubHandler:
         Raises:
             git.GitCommandError: If cloning fails
         """
+        # Credentials are passed to git separately (see _git_clone_env), so
+        # the URL recorded in the clone's config never contains the token
+        clone_url = f"https://github.com/{owner}/{repo_name}.git"
+        
+        multi_options = [
+            "--depth=1",
+            "--single-branch",
+            "--no-tags",
+        ]
+        if branch:
+            multi_options.append(f"--branch={branch}")
+        
+        # A tmpfs clone bypasses the on-disk cache, which would put it on disk first
+        use_cache = _repo_cache_enabled() and not (target_dir is None and _tmpfs_enabled())
+        sha = self._get_head_sha(owner, repo_name, branch) if use_cache else None
+        if sha is None:
+            return self._clone_to_target(
+                lambda target: self._clone(clone_url, target, multi_options, jobs, on_warning),
+                target_dir
+            )
+        
+        # Reuse a cached clone of this exact commit, cloning into the cache on a miss
+        with self._repo_cache_lock(owner, repo_name):
+            cache_dir, created = self._get_cached_clone(
+                owner, repo_name, sha, clone_url, multi_options, jobs, on_warning
+            )
+            repo_path = self._clone_to_target(
+                lambda target: self._copy_cached_clone(cache_dir, target),
+                target_dir
+            )
+        
+        if created:
+            try:
+                self._evict_repo_cache()
+            except OSError:
+                # Eviction is best-effort; never fail a clone that succeeded over it
+                pass
+        
+        return repo_path
+    
+    def _clone_to_target(self, populate: Callable[[Path], Path], target_dir: Optional[Path]) -> Path:
+        """
+        Populate the clone target directory.
+        
+        Args:
+            populate: Function filling a directory with the repository
+            target_dir: Target directory (temp dir if None)
+        
+        Returns:
+            Path to cloned repository
+        """
         if target_dir is None:
+            # Clone into RAM-backed tmpfs when requested, falling back to disk if it fills up
+            if _tmpfs_enabled():
+                try:
+                    tmpfs_dir = Path(tempfile.mkdtemp(prefix="mcp-scan-", dir=TMPFS_DIR))
+                    return populate(tmpfs_dir)
+                except (OSError, git.GitCommandError) as e:
+                    if not _is_out_of_space(e):
+                        raise
             target_dir = Path(tempfile.mkdtemp(prefix="mcp-scan-"))
         
-        # Use authenticated URL for private repos
-        owner, repo_name = self.parse_repo_url(repo_url)
-        auth_url = f"https://{self.token}@github.com/{owner}/{repo_name}.git"
+        return populate(target_dir)
+    
+    def _get_head_sha(self, owner: str, repo_name: str, branch: Optional[str] = None) -> Optional[str]:
+        """
+        Get the commit SHA a clone would check out, without cloning.
+        
+        Args:
+            owner: Repository owner
+            repo_name: Repository name
+            branch: Branch name (default branch if None)
+        
+        Returns:
+            Commit SHA, or None if it could not be determined
+        """
+        ref = branch or "HEAD"
+        
+        def _fetch() -> str:
+            # The sha media type returns the bare commit SHA instead of the full commit
+            status, response_headers, body = self.client.requester.requestJson(
+                "GET",
+                f"/repos/{owner}/{repo_name}/commits/{ref}",
+                headers={"Accept": "application/vnd.github.sha"}
+            )
+            if status >= 400:
+                raise GithubException(status=status, data={"message": body}, headers=response_headers)
+            return body.strip()
+        
+        try:
+            sha = self.rate_limiter.call(_fetch)
+        except GithubException:
+            return None
+        
+        return sha if _SHA_RE.fullmatch(sha) else None
+    
+    @contextmanager
+    def _repo_cache_lock(self, owner: str, repo_name: str, blocking: bool = True) -> Iterator[bool]:
+        """
+        Hold an exclusive per-repository lock on the clone cache.
+        
+        Serializes scans of the same repository across threads and processes.
+        Without fcntl (Windows) no locking is done.
+        
+        Args:
+            owner: Repository owner
+            repo_name: Repository name
+            blocking: Wait for the lock instead of giving up
+        
+        Yields:
+            True if the lock is held, False if it was busy and blocking is False
+        """
+        lock_path = self._cache_root / owner / f"{repo_name}.lock"
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        self._cache_root.chmod(0o700)
+        
+        with open(lock_path, "a") as lock_file:
+            if fcntl is None:
+                yield True
+                return
+            
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _get_cached_clone(
+        self,
+        owner: str,
+        repo_name: str,
+        sha: str,
+        clone_url: str,
+        multi_options: list[str],
+        jobs: int = 1,
+        on_warning: Optional[Callable[[str], None]] = None
+    ) -> tuple[Path, bool]:
+        """
+        Get the cached clone of a commit, cloning it into the cache on a miss.
+        
+        A clone whose submodules could not all be fetched is cached with an
+        incomplete marker and cloned again on the next lookup.
+        
+        Must be called with the repository's cache lock held.
+        
+        Args:
+            owner: Repository owner
+            repo_name: Repository name
+            sha: Commit SHA the clone checks out
+            clone_url: Clone URL, without credentials
+            multi_options: Extra options passed to git clone
+            jobs: Number of submodules fetched in parallel
+            on_warning: Called with a message for each submodule that could not be fetched
+        
+        Returns:
+            Tuple of (cache directory, whether it was just created)
+        
+        Raises:
+            git.GitCommandError: If cloning fails
+        """
+        cache_dir = self._cache_root / owner / f"{repo_name}@{sha}"
+        if cache_dir.is_dir():
+            if not _incomplete_file(cache_dir).exists():
+                # Mark as recently used for LRU eviction
+                os.utime(cache_dir)
+                return cache_dir, False
+            # Cached with empty submodules; clone again to retry them
+            self._remove_cached_clone(cache_dir)
+        
+        failures = []
+        
+        def _collect(message: str) -> None:
+            failures.append(message)
+            if on_warning is not None:
+                on_warning(message)
+        
+        staging_dir = Path(tempfile.mkdtemp(prefix=f".{repo_name}@{sha}-", dir=cache_dir.parent))
+        self._clone(clone_url, staging_dir, multi_options, jobs, _collect)
+        try:
+            repo = git.Repo(staging_dir)
+            
+            # The branch may have moved between the API lookup and the clone;
+            # file the clone under the commit it actually checked out
+            head_sha = repo.head.commit.hexsha
+            if head_sha != sha:
+                cache_dir = cache_dir.with_name(f"{repo_name}@{head_sha}")
+                if cache_dir.is_dir():
+                    if not _incomplete_file(cache_dir).exists():
+                        self.cleanup_repo(staging_dir)
+                        os.utime(cache_dir)
+                        return cache_dir, False
+                    self._remove_cached_clone(cache_dir)
+            
+            # Marked before publishing, so an interrupted scan never leaves
+            # an incomplete clone that looks complete
+            if failures:
+                _incomplete_file(cache_dir).touch()
+            else:
+                _incomplete_file(cache_dir).unlink(missing_ok=True)
+            
+            # Recorded once here so eviction never has to walk the cache
+            size = _dir_size(staging_dir)
+            os.replace(staging_dir, cache_dir)
+        except BaseException:
+            self.cleanup_repo(staging_dir)
+            raise
+        
+        try:
+            _size_file(cache_dir).write_text(str(size))
+        except OSError:
+            pass
+        
+        return cache_dir, True
+    
+    def _copy_cached_clone(self, cache_dir: Path, target_dir: Path) -> Path:
+        """
+        Copy a cached clone into the target directory.
+        
+        Only git object stores (.git/objects and those of submodules under
+        .git/modules) are hardlinked: git never modifies object files in
+        place. The working tree, index and refs are copied, so a scan that
+        writes to them cannot change the cached clone.
+        
+        Args:
+            cache_dir: Cached clone
+            target_dir: Target directory
+        
+        Returns:
+            Path to the copy
+        """
+        git_dir = str(cache_dir / ".git")
+        object_dirs = []
+        
+        def _skip_object_dirs(path: str, names: list[str]) -> set[str]:
+            # An objects directory next to HEAD inside .git is an object store
+            if "objects" in names and "HEAD" in names and os.path.commonpath([path, git_dir]) == git_dir:
+                object_dirs.append(os.path.join(path, "objects"))
+                return {"objects"}
+            return set()
+        
+        try:
+            shutil.copytree(
+                cache_dir,
+                target_dir,
+                symlinks=True,
+                ignore=_skip_object_dirs,
+                dirs_exist_ok=True
+            )
+            for object_dir in object_dirs:
+                shutil.copytree(
+                    object_dir,
+                    target_dir / os.path.relpath(object_dir, cache_dir),
+                    symlinks=True,
+                    copy_function=_link_or_copy
+                )
+        except BaseException:
+            self.cleanup_repo(target_dir)
+            raise
+        
+        return target_dir
+    
+    def _evict_repo_cache(self) -> None:
+        """
+        Remove least recently used cached clones until the cache fits its size cap.
+        
+        Entries removed by another scan in the meantime are skipped.
+        """
+        entries = []
+        with os.scandir(self._cache_root) as owner_dirs:
+            for owner_dir in owner_dirs:
+                if not owner_dir.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    with os.scandir(owner_dir.path) as clones:
+                        for entry in clones:
+                            if entry.name.startswith(".") or "@" not in entry.name:
+                                continue
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    entries.append((entry.stat(follow_symlinks=False).st_mtime, Path(entry.path)))
+                            except OSError:
+                                # Removed by another scan while listing
+                                continue
+                except OSError:
+                    continue
+        
+        sizes = {path: _cached_clone_size(path) for _, path in entries}
+        total = sum(sizes.values())
+        
+        for _, path in sorted(entries):
+            if total <= REPO_CACHE_MAX_BYTES:
+                break
+            
+            repo_name = path.name.rpartition("@")[0]
+            # Skip entries another scan is using right now
+            with self._repo_cache_lock(path.parent.name, repo_name, blocking=False) as locked:
+                if locked:
+                    self._remove_cached_clone(path)
+                    total -= sizes[path]
+    
+    def _remove_cached_clone(self, cache_dir: Path) -> None:
+        """
+        Remove a cached clone along with its size record and incomplete marker.
+        
+        Must be called with the repository's cache lock held.
+        
+        Args:
+            cache_dir: Cached clone
+        """
+        self.cleanup_repo(cache_dir)
+        _size_file(cache_dir).unlink(missing_ok=True)
+        _incomplete_file(cache_dir).unlink(missing_ok=True)
+    
+    def _clone(
+        self,
+        clone_url: str,
+        target_dir: Path,
+        multi_options: list[str],
+        jobs: int = 1,
+        on_warning: Optional[Callable[[str], None]] = None
+    ) -> Path:
+        """
+        Clone a repository and its submodules into a directory, removing it if cloning fails.
         
+        Submodules are fetched after the superproject on a best-effort basis,
+        so one that cannot be fetched does not fail the clone.
+        
+        Args:
+            clone_url: Clone URL, without credentials
+            target_dir: Target directory for cloning
+            multi_options: Extra options passed to git clone
+            jobs: Number of submodules fetched in parallel
+            on_warning: Called with a message for each submodule that could not be fetched
+        
+        Returns:
+            Path to cloned repository
+        
+        Raises:
+            git.GitCommandError: If cloning fails
+            OSError: If the git executable cannot be run
+        """
         try:
-            git.Repo.clone_from(auth_url, target_dir)
-            return target_dir
-        except git.GitCommandError as e:
+            _git_clone_fast(clone_url, target_dir, multi_options, self.token)
+            failures = _update_submodules(target_dir, jobs, self.token)
+        except BaseException:
             # Clean up on failure
-            if target_dir.exists():
-                shutil.rmtree(target_dir)
+            self.cleanup_repo(target_dir)
             raise
+        
+        if on_warning is not None:
+            for message in failures:
+                on_warning(message)
+        
+        return target_dir
     
     def cleanup_repo(self, repo_path: Path) -> None:
         """
@@ -146,6 +942,14 @@ class GitHubHandler:
         Args:
             repo_path: Path to repository to clean up
         """
-        if repo_path.exists():
-            shutil.rmtree(repo_path)
+        if not repo_path.exists():
+            return
+        
+        # rm -rf unlinks the many small .git/objects files much faster than rmtree
+        if os.name == "posix" and shutil.which("rm"):
+            subprocess.run(["rm", "-rf", "--", str(repo_path)], check=False)
+            if not repo_path.exists():
+                return
+        
+        shutil.rmtree(repo_path, onexc=_remove_readonly)
 
@@ -1,6 +1,5 @@
 from dotenv import load_dotenv
 import os
-load_dotenv()
 
 from agents import Agent, Runner
 from agents.mcp import MCPServer, MCPServerStdio
@@ -10,6 +9,10 @@ from agents import OpenAIChatCompletionsModel
 from pydantic import BaseModel
 from typing import List, Optional
 import asyncio
+import atexit
+import functools
+import hashlib
+import json
 
 # Models
 class MCPFunction(BaseModel):
@@ -33,89 +36,207 @@ class MCPReport(BaseModel):
     vulnerabilities: List[MCPVulnerability]
 
 
-custom_client = AsyncOpenAI(
-    api_key = os.getenv("OPENAI_API_KEY"), 
-)
-set_tracing_disabled(True)
-
-my_model=OpenAIChatCompletionsModel(
-    model="openai/gpt-5-mini",
-    openai_client = custom_client
-)
-
-ast_grep_mcp = MCPServerStdio(
-    name = "ast-grep",
-    params = {
-        "command": "uvx",
-        "args": ["--from", "git+https://github.com/ast-grep/ast-grep-mcp", "ast-grep-server"],
-    },
-    client_session_timeout_seconds=300
-)
-
-xray_mcp = MCPServerStdio(
-    name="xray",
-    params = {
-        "command": "uvx",
-        "args": ["--from", "git+https://github.com/srijanshukla18/xray", "xray-mcp"],
-    },
-    client_session_timeout_seconds = 300,
-)
+MODEL_NAME = "openai/gpt-5-mini"
+
+AGENT_INSTRUCTIONS = """
+        <whoami>
+        You are an expert security code reviewer. 
+        You are given the code for an MCP server, where the codebase.
+        You are tasked with identifying vulnerabilities and profiling the MCP Server codebase for possible security issues.
+        </whoami>
+
+        <task>
+        Analyze the codebase and identify:
+        1. Use ast-grep and xray mcp tools to identify the attack surface
+        2. Identify the following parameters within the codebase:
+            2a. Tech Stack (languages, frameworks and libraries)
+            2b. Authentication/Authorization Mechanisms
+            2c. All user input entry points
+            2d. Sensitive operations (database, file I/O, network, crypto, subprocess)
+            2e. Configuration patterns
+            2f. Identify all the functions of the MCP Server
+
+        3. Based on the parameters identified, identify anomalies or vulnerabilities in the MCP codebase with the following parameters:
+            3a. Hardcoded secrets or sensitive information in the codebase of the MCP Server, especially in prompts. 
+            3b. Use of insecure cryptography, hashing and HMAC functions or parameters.
+            3c. Lack of Input Validation
+            3d. Injection flaws - SQL Injection, Insecure Deserialization, Command Injection, XML External Entities and more.
+            3e. Excessive Data Exposure - based on the functionality and access provided by the MCP Server.
+            3f. Authentication and Authorization Flaws - Long-lived API tokens, Lack of OAuth, Insecure Direct Object Reference, Broken functional authorization, mass assignment
+            3g. Server-side Request Forgery
+            3h. Possibility of Prompt Injection and Indirect Prompt Injection
+            3i. Other OWASP Top 10 vulnerabilities like Path Traversal, etc. 
+
+        NOTE: When dealing with Authentication Flaws, consider the following: 
+        * The authentication might require the user to use static API Tokens, passwords and so on from environment variables. These are findings, as they are not as strong as OAuth flows, but they are not the worst.
+        * Pay special attention to hardcoded authentication parameters if any. Those are particularly bad.
+        * Identify scenarios where credentials may be exposed as part of a prompt injection or indirect prompt injection.
+        </task>
+        
+        <output>
+        Once done - Generate a report with the following information:
+            a. List of Tools available in the MCP Server (by identifying functions).
+            b. List of vulnerabilities and information about each vulnerability.
+                b(1): Name of the vulnerability
+                b(2). Description of the vulnerability
+                b(3). File paths with code snippets of the vulnerability
+                b(4). Recommendation to fix the vulnerability
+                b(5). Severity of the vulnerability
+                b(6). Confidence level of the vulnerability
+        </output>
+        """
+
+# Identifies what the agent produces; part of the scanner's report cache key,
+# so changing the model, prompt or report schema invalidates cached reports
+AGENT_FINGERPRINT = hashlib.sha256(
+    "\0".join([MODEL_NAME, AGENT_INSTRUCTIONS, json.dumps(MCPReport.model_json_schema(), sort_keys=True)]).encode()
+).hexdigest()[:12]
+
+
+# Clients and server specs are built on first scan, not at import time
+@functools.cache
+def _get_model() -> OpenAIChatCompletionsModel:
+    load_dotenv()
+    custom_client = AsyncOpenAI(
+        api_key = os.getenv("OPENAI_API_KEY"), 
+    )
+    set_tracing_disabled(True)
+
+    return OpenAIChatCompletionsModel(
+        model=MODEL_NAME,
+        openai_client = custom_client
+    )
+
+@functools.cache
+def _get_mcps() -> tuple[MCPServerStdio, MCPServerStdio]:
+    ast_grep_mcp = MCPServerStdio(
+        name = "ast-grep",
+        params = {
+            "command": "uvx",
+            "args": ["--from", "git+https://github.com/ast-grep/ast-grep-mcp", "ast-grep-server"],
+        },
+        client_session_timeout_seconds=300
+    )
+
+    xray_mcp = MCPServerStdio(
+        name="xray",
+        params = {
+            "command": "uvx",
+            "args": ["--from", "git+https://github.com/srijanshukla18/xray", "xray-mcp"],
+        },
+        client_session_timeout_seconds = 300,
+    )
+
+    return ast_grep_mcp, xray_mcp
+
+# MCP servers are started once per event loop and kept alive across scans.
+# Each server is entered and exited by its own long-lived owner task, since
+# the SDK's anyio cancel scopes must be exited in the task that entered them
+_mcp_owners: list[asyncio.Task] = []
+_mcp_stop: Optional[asyncio.Event] = None
+_mcp_loop: Optional[asyncio.AbstractEventLoop] = None
+_mcp_lock: Optional[asyncio.Lock] = None
+
+async def _own_server(server: MCPServer, started: asyncio.Future, stop: asyncio.Event) -> None:
+    async with server:
+        started.set_result(None)
+        await stop.wait()
+
+async def _wait_started(started: asyncio.Future, owner: asyncio.Task) -> None:
+    await asyncio.wait({started, owner}, return_when=asyncio.FIRST_COMPLETED)
+    if not started.done():
+        # The owner exited before the server came up; re-raise its error
+        owner.result()
+
+async def _get_mcp_servers() -> tuple[MCPServerStdio, MCPServerStdio]:
+    global _mcp_owners, _mcp_stop, _mcp_loop, _mcp_lock
+    loop = asyncio.get_running_loop()
+    if _mcp_loop is not loop:
+        # Servers started on a previous loop cannot be used from this one
+        _mcp_owners = []
+        _mcp_stop = None
+        _mcp_loop = loop
+        _mcp_lock = asyncio.Lock()
+
+    servers = _get_mcps()
+    async with _mcp_lock:
+        if any(owner.done() for owner in _mcp_owners):
+            # A server exited (its uvx process died); replace the whole pool
+            await _shutdown_owners(_mcp_owners, _mcp_stop)
+            _mcp_owners, _mcp_stop = [], None
+        if not _mcp_owners:
+            stop = asyncio.Event()
+            started = [loop.create_future() for _ in servers]
+            owners = [
+                asyncio.create_task(_own_server(server, future, stop))
+                for server, future in zip(servers, started)
+            ]
+            try:
+                # Start both servers concurrently so their stdio handshakes overlap
+                await asyncio.gather(*map(_wait_started, started, owners))
+            except BaseException:
+                stop.set()
+                await asyncio.gather(*owners, return_exceptions=True)
+                raise
+            _mcp_owners, _mcp_stop = owners, stop
+
+    return servers
+
+async def _shutdown_owners(owners: list[asyncio.Task], stop: asyncio.Event) -> None:
+    stop.set()
+    await asyncio.gather(*owners, return_exceptions=True)
+
+async def close_mcp_servers(owners: Optional[list[asyncio.Task]] = None) -> None:
+    # Shuts the servers down and waits for their uvx subprocesses to exit.
+    # Given the owners of a specific pool, only that pool is shut down, so a
+    # pool another scan has already replaced is left alone
+    global _mcp_owners, _mcp_stop
+    if not _mcp_owners or _mcp_loop is not asyncio.get_running_loop():
+        return
+    if owners is not None and owners is not _mcp_owners:
+        return
+    owners, stop = _mcp_owners, _mcp_stop
+    _mcp_owners, _mcp_stop = [], None
+    await _shutdown_owners(owners, stop)
+
+async def _servers_healthy(servers: tuple[MCPServerStdio, ...]) -> bool:
+    # A round trip on each session tells a broken server from a failed agent run
+    try:
+        await asyncio.wait_for(asyncio.gather(*(server.list_tools() for server in servers)), timeout=30)
+    except Exception:
+        return False
+    return True
+
+def _close_mcp_servers() -> None:
+    if not _mcp_owners or _mcp_loop is None or _mcp_loop.is_closed():
+        return
+    if _mcp_loop.is_running():
+        # The scanner keeps its agent loop running in a background thread
+        try:
+            asyncio.run_coroutine_threadsafe(close_mcp_servers(), _mcp_loop).result(timeout=30)
+        except Exception:
+            pass
+    else:
+        _mcp_loop.run_until_complete(close_mcp_servers())
+
+atexit.register(_close_mcp_servers)
 
 async def run_mcp_scan_agent(path_str: str):
-    async with ast_grep_mcp as ast_client, xray_mcp as mcp:
-        agent = Agent(
-            name = "mcp_scan_agent",
-            model = my_model,
-            output_type=MCPReport,
-            instructions = """
-            <whoami>
-            You are an expert security code reviewer. 
-            You are given the code for an MCP server, where the codebase.
-            You are tasked with identifying vulnerabilities and profiling the MCP Server codebase for possible security issues.
-            </whoami>
-
-            <task>
-            Analyze the codebase and identify:
-            1. Use ast-grep and xray mcp tools to identify the attack surface
-            2. Identify the following parameters within the codebase:
-                2a. Tech Stack (languages, frameworks and libraries)
-                2b. Authentication/Authorization Mechanisms
-                2c. All user input entry points
-                2d. Sensitive operations (database, file I/O, network, crypto, subprocess)
-                2e. Configuration patterns
-                2f. Identify all the functions of the MCP Server
-
-            3. Based on the parameters identified, identify anomalies or vulnerabilities in the MCP codebase with the following parameters:
-                3a. Hardcoded secrets or sensitive information in the codebase of the MCP Server, especially in prompts. 
-                3b. Use of insecure cryptography, hashing and HMAC functions or parameters.
-                3c. Lack of Input Validation
-                3d. Injection flaws - SQL Injection, Insecure Deserialization, Command Injection, XML External Entities and more.
-                3e. Excessive Data Exposure - based on the functionality and access provided by the MCP Server.
-                3f. Authentication and Authorization Flaws - Long-lived API tokens, Lack of OAuth, Insecure Direct Object Reference, Broken functional authorization, mass assignment
-                3g. Server-side Request Forgery
-                3h. Possibility of Prompt Injection and Indirect Prompt Injection
-                3i. Other OWASP Top 10 vulnerabilities like Path Traversal, etc. 
-
-            NOTE: When dealing with Authentication Flaws, consider the following: 
-            * The authentication might require the user to use static API Tokens, passwords and so on from environment variables. These are findings, as they are not as strong as OAuth flows, but they are not the worst.
-            * Pay special attention to hardcoded authentication parameters if any. Those are particularly bad.
-            * Identify scenarios where credentials may be exposed as part of a prompt injection or indirect prompt injection.
-            </task>
-            
-            <output>
-            Once done - Generate a report with the following information:
-                a. List of Tools available in the MCP Server (by identifying functions).
-                b. List of vulnerabilities and information about each vulnerability.
-                    b(1): Name of the vulnerability
-                    b(2). Description of the vulnerability
-                    b(3). File paths with code snippets of the vulnerability
-                    b(4). Recommendation to fix the vulnerability
-                    b(5). Severity of the vulnerability
-                    b(6). Confidence level of the vulnerability
-            </output>
-            """,
-            mcp_servers = [ast_client, xray_mcp],
-        )
-        prompt = path_str
+    ast_client, xray_client = await _get_mcp_servers()
+    agent = Agent(
+        name = "mcp_scan_agent",
+        model = _get_model(),
+        output_type=MCPReport,
+        instructions = AGENT_INSTRUCTIONS,
+        mcp_servers = [ast_client, xray_client],
+    )
+    prompt = path_str
+    owners = _mcp_owners
+    try:
         runner=await Runner.run(agent, prompt, max_turns=100)
-        return runner.final_output
\ No newline at end of file
+    except Exception:
+        # Don't leave a dead server in the pool for the next scan
+        if not await _servers_healthy((ast_client, xray_client)):
+            await close_mcp_servers(owners)
+        raise
+    return runner.final_output
\ No newline at end of file
@@ -1,11 +1,128 @@
 """Report generation for scan results."""
 
+import io
 import json
+from itertools import groupby
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, TextIO
 from datetime import datetime
 
 
+# Large write buffer so multi-MB reports are written in few syscalls
+REPORT_BUFFER_SIZE = 1 << 20
+
+SEVERITY_ORDER = ["critical", "high", "medium", "low", "info"]
+SEV_RANK = {severity: rank for rank, severity in enumerate(SEVERITY_ORDER)}
+
+# Markdown report templates, filled with str.format_map
+HEADER_TMPL = (
+    "# Security Scan Report\n\n"
+    "**Scan ID:** {scan_id}  \n"
+    "**Timestamp:** {timestamp}  \n\n"
+)
+
+REPO_TMPL = (
+    "## Repository Information\n\n"
+    "- **Name:** {full_name}\n"
+    "- **Description:** {description}\n"
+    "- **Language:** {language}\n"
+    "- **Stars:** {stars}\n"
+    "- **Forks:** {forks}\n"
+    "- **Default Branch:** {default_branch}\n\n"
+)
+REPO_DEFAULTS = {
+    "full_name": "N/A",
+    "description": "N/A",
+    "language": "N/A",
+    "stars": 0,
+    "forks": 0,
+    "default_branch": "N/A",
+}
+
+MCP_TOOLS_TMPL = (
+    "## MCP Server Functions\n\n"
+    "Found **{count}** MCP server function(s)/tool(s):\n\n"
+    "| Function Name | Description |\n"
+    "|---------------|-------------|\n"
+)
+MCP_TOOL_ROW_TMPL = "| `{name}` | {description} |\n"
+TOOL_DEFAULTS = {"name": "N/A", "description": "N/A"}
+
+SUMMARY_TMPL = (
+    "## Scan Summary\n\n"
+    "**Total Findings:** {total_findings}\n\n"
+    "| Severity | Count |\n"
+    "|----------|-------|\n"
+    "| Critical | {critical} |\n"
+    "| High     | {high} |\n"
+    "| Medium   | {medium} |\n"
+    "| Low      | {low} |\n"
+    "| Info     | {info} |\n\n"
+)
+SUMMARY_DEFAULTS = {"total_findings": 0, **{sev: 0 for sev in SEVERITY_ORDER}}
+
+STATS_TMPL = (
+    "## Repository Statistics\n\n"
+    "- **Total Files:** {total_files}\n"
+    "- **Total Lines:** {total_lines}\n\n"
+)
+STATS_DEFAULTS = {"total_files": 0, "total_lines": 0}
+
+FILE_TYPES_TMPL = (
+    "### File Types Distribution\n\n"
+    "| Extension | Count |\n"
+    "|-----------|-------|\n"
+)
+
+FINDING_TMPL = (
+    "#### {id}: {title}\n\n"
+    "**Description:** {description}  \n"
+    "**Category:** {category}  \n"
+)
+FINDING_DEFAULTS = {
+    "id": "N/A",
+    "title": "No title",
+    "description": "N/A",
+    "category": "N/A",
+}
+
+FOOTER_TMPL = "---\n\n*Report generated by MCP Security Profiler v{version}*"
+
+
+def _indent_json(text: str, level: int) -> str:
+    """Indent all but the first line of a JSON document (strings never contain raw newlines)."""
+    return text.replace("\n", "\n" + "  " * level)
+
+
+def _write_json_stream(f: TextIO, data: Dict[str, Any]) -> None:
+    """
+    Write a dictionary as indented JSON, one top-level value or list item at a time.
+    
+    Produces the same output as ``json.dump(data, f, indent=2)`` while only
+    ever holding a single finding's serialized text in memory, and writes
+    whole items instead of the encoder's many small chunks.
+    
+    Args:
+        f: Text file to write to
+        data: Dictionary to serialize
+    """
+    if not data:
+        f.write("{}")
+        return
+    
+    f.write("{")
+    for i, (key, value) in enumerate(data.items()):
+        f.write(f"{',' if i else ''}\n  {json.dumps(key)}: ")
+        if isinstance(value, list) and value:
+            f.write("[")
+            for j, item in enumerate(value):
+                f.write(f"{',' if j else ''}\n    {_indent_json(json.dumps(item, indent=2), 2)}")
+            f.write("\n  ]")
+        else:
+            f.write(_indent_json(json.dumps(value, indent=2), 1))
+    f.write("\n}")
+
+
 class ReportGenerator:
     """Generate reports in various formats."""
     
@@ -25,8 +142,8 @@ class ReportGenerator:
         Args:
             output_path: Path to output file
         """
-        with open(output_path, "w") as f:
-            json.dump(self.scan_results, f, indent=2)
+        with open(output_path, "w", buffering=REPORT_BUFFER_SIZE) as f:
+            _write_json_stream(f, self.scan_results)
     
     def generate_markdown(self, output_path: Path) -> None:
         """
@@ -36,7 +153,7 @@ class ReportGenerator:
             output_path: Path to output file
         """
         md_content = self._build_markdown()
-        with open(output_path, "w") as f:
+        with open(output_path, "w", buffering=REPORT_BUFFER_SIZE) as f:
             f.write(md_content)
     
     def _build_markdown(self) -> str:
@@ -47,117 +164,91 @@ class ReportGenerator:
         stats = self.scan_results.get("statistics", {})
         mcp_tools = self.scan_results.get("mcp_tools", [])
         
-        md = []
+        buf = io.StringIO()
+        write = buf.write
         
         # Header
-        md.append("# Security Scan Report\n")
-        md.append(f"**Scan ID:** {self.scan_results.get('scan_id', 'N/A')}  ")
-        md.append(f"**Timestamp:** {self.scan_results.get('timestamp', 'N/A')}  \n")
+        write(HEADER_TMPL.format_map({
+            "scan_id": self.scan_results.get("scan_id", "N/A"),
+            "timestamp": self.scan_results.get("timestamp", "N/A"),
+        }))
         
         # Repository Information
-        md.append("## Repository Information\n")
-        md.append(f"- **Name:** {repo_info.get('full_name', 'N/A')}")
-        md.append(f"- **Description:** {repo_info.get('description', 'N/A')}")
-        md.append(f"- **Language:** {repo_info.get('language', 'N/A')}")
-        md.append(f"- **Stars:** {repo_info.get('stars', 0)}")
-        md.append(f"- **Forks:** {repo_info.get('forks', 0)}")
-        md.append(f"- **Default Branch:** {repo_info.get('default_branch', 'N/A')}\n")
+        write(REPO_TMPL.format_map({**REPO_DEFAULTS, **repo_info}))
         
         # MCP Tools/Functions Section
         if mcp_tools:
-            md.append("## MCP Server Functions\n")
-            md.append(f"Found **{len(mcp_tools)}** MCP server function(s)/tool(s):\n")
-            md.append("| Function Name | Description |")
-            md.append("|---------------|-------------|")
+            write(MCP_TOOLS_TMPL.format_map({"count": len(mcp_tools)}))
             for tool in mcp_tools:
-                md.append(f"| `{tool.get('name', 'N/A')}` | {tool.get('description', 'N/A')} |")
-            md.append("")
+                write(MCP_TOOL_ROW_TMPL.format_map({**TOOL_DEFAULTS, **tool}))
+            write("\n")
         
         # Summary
-        md.append("## Scan Summary\n")
-        md.append(f"**Total Findings:** {summary.get('total_findings', 0)}\n")
-        
-        md.append("| Severity | Count |")
-        md.append("|----------|-------|")
-        md.append(f"| Critical | {summary.get('critical', 0)} |")
-        md.append(f"| High     | {summary.get('high', 0)} |")
-        md.append(f"| Medium   | {summary.get('medium', 0)} |")
-        md.append(f"| Low      | {summary.get('low', 0)} |")
-        md.append(f"| Info     | {summary.get('info', 0)} |\n")
+        write(SUMMARY_TMPL.format_map({**SUMMARY_DEFAULTS, **summary}))
         
         # Statistics
-        md.append("## Repository Statistics\n")
-        md.append(f"- **Total Files:** {stats.get('total_files', 0)}")
-        md.append(f"- **Total Lines:** {stats.get('total_lines', 0)}\n")
+        write(STATS_TMPL.format_map({**STATS_DEFAULTS, **stats}))
         
         if stats.get('file_types'):
-            md.append("### File Types Distribution\n")
+            write(FILE_TYPES_TMPL)
             file_types = sorted(stats['file_types'].items(), key=lambda x: x[1], reverse=True)
-            md.append("| Extension | Count |")
-            md.append("|-----------|-------|")
             for ext, count in file_types[:10]:  # Top 10
-                md.append(f"| {ext} | {count} |")
-            md.append("")
+                write(f"| {ext} | {count} |\n")
+            write("\n")
         
         # Findings
+        write("## Findings\n\n")
         if findings:
-            md.append("## Findings\n")
-            
-            # Group by severity
-            severity_order = ["critical", "high", "medium", "low", "info"]
-            findings_by_severity = {sev: [] for sev in severity_order}
-            
-            for finding in findings:
+            # Sort once by severity rank; unknown severities follow the known ones
+            def severity_key(finding: Dict[str, Any]) -> tuple[int, str]:
                 severity = finding.get("severity", "info").lower()
-                if severity in findings_by_severity:
-                    findings_by_severity[severity].append(finding)
+                return SEV_RANK.get(severity, len(SEV_RANK)), severity
             
-            for severity in severity_order:
-                severity_findings = findings_by_severity[severity]
-                if severity_findings:
-                    md.append(f"### {severity.capitalize()} Severity\n")
-                    
-                    for finding in severity_findings:
-                        md.append(f"#### {finding.get('id', 'N/A')}: {finding.get('title', 'No title')}\n")
-                        md.append(f"**Description:** {finding.get('description', 'N/A')}  ")
-                        md.append(f"**Category:** {finding.get('category', 'N/A')}  ")
-                        
-                        # Add confidence level for MCP findings
-                        if finding.get('confidence'):
-                            md.append(f"**Confidence:** {finding['confidence']}  ")
-                        
-                        if finding.get('file'):
-                            md.append(f"**File:** `{finding['file']}`  ")
-                        
-                        # Display affected files with code snippets for MCP findings
-                        if finding.get('affected_files'):
-                            md.append(f"\n**Affected Files:**")
-                            for idx, file_info in enumerate(finding['affected_files'], 1):
-                                md.append(f"\n{idx}. `{file_info.get('path', 'Unknown')}`")
-                                if file_info.get('code_snippet'):
-                                    md.append(f"```")
-                                    md.append(file_info['code_snippet'])
-                                    md.append(f"```")
-                        
-                        # Display MCP tools if present
-                        if finding.get('tools'):
-                            md.append(f"\n**MCP Tools Found:**")
-                            for tool in finding['tools']:
-                                md.append(f"- **{tool.get('name')}**: {tool.get('description')}")
-                        
-                        if finding.get('recommendation'):
-                            md.append(f"\n**Recommendation:** {finding['recommendation']}  ")
-                        
-                        md.append("")
+            for (_, severity), severity_findings in groupby(sorted(findings, key=severity_key), key=severity_key):
+                write(f"### {severity.capitalize()} Severity\n\n")
+                for finding in severity_findings:
+                    write(self._format_finding(finding))
         else:
-            md.append("## Findings\n")
-            md.append("No findings detected.\n")
+            write("No findings detected.\n\n")
         
         # Footer
-        md.append("---")
-        md.append(f"\n*Report generated by MCP Security Profiler v{self.scan_results.get('scan_metadata', {}).get('scanner_version', '0.1.0')}*")
+        write(FOOTER_TMPL.format_map({
+            "version": self.scan_results.get("scan_metadata", {}).get("scanner_version", "0.1.0"),
+        }))
+        
+        return buf.getvalue()
+    
+    @staticmethod
+    def _format_finding(finding: Dict[str, Any]) -> str:
+        """Format a single finding as a markdown block."""
+        parts = [FINDING_TMPL.format_map({**FINDING_DEFAULTS, **finding})]
+        
+        # Add confidence level for MCP findings
+        if finding.get('confidence'):
+            parts.append(f"**Confidence:** {finding['confidence']}  \n")
+        
+        if finding.get('file'):
+            parts.append(f"**File:** `{finding['file']}`  \n")
+        
+        # Display affected files with code snippets for MCP findings
+        if finding.get('affected_files'):
+            parts.append("\n**Affected Files:**\n")
+            for idx, file_info in enumerate(finding['affected_files'], 1):
+                parts.append(f"\n{idx}. `{file_info.get('path', 'Unknown')}`\n")
+                if file_info.get('code_snippet'):
+                    parts.append(f"```\n{file_info['code_snippet']}\n```\n")
+        
+        # Display MCP tools if present
+        if finding.get('tools'):
+            parts.append("\n**MCP Tools Found:**\n")
+            for tool in finding['tools']:
+                parts.append(f"- **{tool.get('name')}**: {tool.get('description')}\n")
+        
+        if finding.get('recommendation'):
+            parts.append(f"\n**Recommendation:** {finding['recommendation']}  \n")
         
-        return "\n".join(md)
+        parts.append("\n")
+        return "".join(parts)
 
 
 def generate_reports(scan_results: Dict[str, Any], output_dir: Path, formats: list[str]) -> Dict[str, Path]:
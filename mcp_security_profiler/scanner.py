@@ -2,8 +2,587 @@
 
 import datetime
 import asyncio
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import cache, partial
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import IO, Dict, Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+
+try:
+    # Optional: libuv-based event loop with cheaper socket/subprocess dispatch
+    import uvloop
+except ImportError:  # Not installed, or Windows (unsupported)
+    uvloop = None
+
+from mcp_security_profiler import __version__
+from mcp_security_profiler.config import Config
+
+SCANNER_VERSION = __version__
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Event loop used for the MCP agent; the default asyncio loop without uvloop
+_LOOP_FACTORY = uvloop.new_event_loop if uvloop is not None else None
+
+
+# Persistent event loop for the MCP agent, started on first use
+_agent_loop: Optional[asyncio.AbstractEventLoop] = None
+_agent_loop_lock = threading.Lock()
+
+
+# Worker threads for the statistics walk
+STATS_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files queued for line counting at once; bounds memory on huge repositories
+STATS_MAX_PENDING = STATS_MAX_WORKERS * 4
+
+# Read size for line counting
+COUNT_CHUNK_SIZE = 1 << 20
+
+# Directory and file names excluded from statistics; ignored directories are
+# pruned during the walk so their contents are never enumerated
+_IGNORE = frozenset({
+    ".git",
+    "__pycache__",
+    "node_modules",
+    ".env",
+    "venv",
+    ".venv",
+    "dist",
+    "build",
+})
+
+# Only these files are opened for line counting; images, archives and other
+# binaries are still tallied by extension but never read
+_TEXT_EXTS = frozenset({
+    ".py", ".pyi", ".ipynb", ".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx",
+    ".vue", ".svelte", ".go", ".rs", ".c", ".h", ".cc", ".cpp", ".cxx", ".hpp",
+    ".hh", ".java", ".kt", ".kts", ".scala", ".groovy", ".gradle", ".rb", ".php",
+    ".cs", ".fs", ".swift", ".m", ".mm", ".dart", ".lua", ".pl", ".pm", ".r",
+    ".jl", ".ex", ".exs", ".erl", ".hs", ".clj", ".ml", ".zig", ".sol", ".sh",
+    ".bash", ".zsh", ".fish", ".ps1", ".bat", ".cmd", ".sql", ".graphql",
+    ".gql", ".proto", ".html", ".htm", ".css", ".scss", ".sass", ".less",
+    ".md", ".mdx", ".rst", ".txt", ".adoc", ".tex", ".json", ".jsonl",
+    ".yaml", ".yml", ".toml", ".ini", ".cfg", ".conf", ".properties", ".xml",
+    ".csv", ".tsv", ".tf", ".hcl", ".nix", ".mk", ".cmake", ".lock",
+    ".dockerfile", ".env", ".example",
+})
+_TEXT_FILENAMES = frozenset({
+    "Dockerfile", "Makefile", "Gemfile", "Rakefile", "Procfile", "Jenkinsfile",
+    "Vagrantfile", "LICENSE", "README", "CODEOWNERS",
+})
+
+
+def _count_lines(file_path: str) -> int:
+    """
+    Count the lines of a file by counting newline bytes.
+    
+    Reads raw 1 MiB chunks instead of decoding and iterating line by line.
+    A final line without a trailing newline is counted too.
+    
+    Args:
+        file_path: File path
+    
+    Returns:
+        Number of lines
+    """
+    lines = 0
+    last_chunk = b""
+    with open(file_path, "rb", buffering=0) as f:
+        for chunk in iter(lambda: f.read(COUNT_CHUNK_SIZE), b""):
+            lines += chunk.count(b"\n")
+            last_chunk = chunk
+    
+    if last_chunk and not last_chunk.endswith(b"\n"):
+        lines += 1
+    return lines
+
+
+def _walk(root: Path) -> Iterator[str]:
+    """
+    Yield the paths of all files under a directory, skipping ignored names.
+    
+    Uses os.scandir so file types come from the directory entry without an
+    extra stat, and ignored directories are never descended into. Symlinks
+    are not followed.
+    
+    Args:
+        root: Directory to walk
+    
+    Yields:
+        File paths
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.name in _IGNORE:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path
+        except OSError:
+            continue
+
+
+@cache
+def _rg_executable() -> Optional[str]:
+    """Locate the ripgrep binary, if installed."""
+    return shutil.which("rg")
+
+
+def _walk_rg(rg: str, root: Path) -> Iterator[str]:
+    """
+    Yield the paths of all files under a directory using ripgrep.
+    
+    ripgrep traverses directories natively and in parallel. Ignore files
+    are disabled and the names in _IGNORE are excluded with globs, so the
+    same files are listed as by _walk, in no particular order; symlinks
+    are not followed.
+    
+    Args:
+        rg: Path to the ripgrep binary
+        root: Directory to walk
+    
+    Yields:
+        File paths
+    
+    Raises:
+        subprocess.CalledProcessError: If ripgrep exits with an error
+    """
+    cmd = [
+        rg, "--files", "--no-config", "--no-ignore", "--hidden", "--null",
+        "--no-messages", *(f"--glob=!{name}" for name in sorted(_IGNORE)),
+        "--", str(root),
+    ]
+    # stderr goes to a file so a chatty ripgrep can never block on a full pipe
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            pending = b""
+            for chunk in iter(partial(proc.stdout.read1, COUNT_CHUNK_SIZE), b""):
+                *paths, pending = (pending + chunk).split(b"\0")
+                for path in paths:
+                    yield os.fsdecode(path)
+            
+            # 1 only means no files were found
+            if proc.wait() not in (0, 1):
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(
+                    proc.returncode, cmd, stderr=stderr.read().decode(errors="replace")
+                )
+        finally:
+            # Stop ripgrep early if the consumer gave up on the walk
+            proc.kill()
+            proc.stdout.close()
+            proc.wait()
+
+
+def _walk_files(root: Path) -> Iterator[str]:
+    """
+    Yield the paths of all files under a directory, skipping ignored names.
+    
+    Uses ripgrep when it is installed and falls back to _walk otherwise,
+    or if ripgrep fails before listing any file (e.g. too old for its
+    options).
+    
+    Args:
+        root: Directory to walk
+    
+    Yields:
+        File paths
+    
+    Raises:
+        subprocess.CalledProcessError: If ripgrep fails partway through the walk
+    """
+    rg = _rg_executable()
+    if rg is None:
+        yield from _walk(root)
+        return
+    
+    listed = False
+    try:
+        for path in _walk_rg(rg, root):
+            listed = True
+            yield path
+    except subprocess.CalledProcessError:
+        # Files already yielded cannot be taken back; falling back would count them twice
+        if listed:
+            raise
+        yield from _walk(root)
+
+
+def _list_dir(path: Path) -> set[str]:
+    """
+    List the entry names of a directory.
+    
+    Args:
+        path: Directory path
+    
+    Returns:
+        Set of entry names, empty if the directory cannot be read
+    """
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+def _count_file(
+    file_path: str,
+    root_len: int,
+    blob_ids: Dict[str, str],
+    line_cache: Dict[str, int]
+) -> tuple[str, str, int, Optional[str]]:
+    """
+    Count the lines of a file, reusing a cached count if its content was seen before.
+    
+    Args:
+        file_path: File path
+        root_len: Length of the repository root prefix of file_path
+        blob_ids: Git blob IDs of tracked files, keyed by relative path
+        line_cache: Line counts from previous scans, keyed by git blob ID
+    
+    Returns:
+        Tuple of (relative path, extension, line count, blob ID); non-text,
+        untracked or unreadable files have no blob ID
+    """
+    rel_path = file_path[root_len:]
+    name = os.path.basename(file_path)
+    suffix = os.path.splitext(name)[1]
+    ext = suffix or "no_extension"
+    if suffix.lower() not in _TEXT_EXTS and name not in _TEXT_FILENAMES:
+        return rel_path, ext, 0, None
+    
+    blob_id = blob_ids.get(rel_path)
+    lines = line_cache.get(blob_id) if blob_id is not None else None
+    if lines is not None:
+        return rel_path, ext, lines, blob_id
+    
+    try:
+        # Single stat per text file, and none for anything else
+        if os.lstat(file_path).st_size == 0:
+            return rel_path, ext, 0, blob_id
+        return rel_path, ext, _count_lines(file_path), blob_id
+    except Exception:
+        return rel_path, ext, 0, None
+
+
+def _map_bounded(
+    executor: Executor,
+    func: Callable[[T], R],
+    iterable: Iterable[T],
+    max_pending: int
+) -> Iterator[R]:
+    """
+    Map a function over an iterable in an executor, yielding results in order.
+    
+    Unlike Executor.map, which submits the whole iterable up front, at most
+    max_pending calls are queued at a time, so a lazy input such as a
+    directory walk is consumed only as fast as results are taken.
+    
+    Args:
+        executor: Executor to run calls in
+        func: Function to apply
+        iterable: Input items
+        max_pending: Maximum number of submitted calls without a taken result
+    
+    Yields:
+        Results of func, in input order
+    """
+    pending = deque()
+    for item in iterable:
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, item))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _stats_file_base(repo_key: str) -> Path:
+    """
+    Get the path, without suffix, of a repository's statistics files.
+    
+    Repositories are filed as <owner>/<repo>, like the HTTP and clone
+    caches, so distinct repositories never share files. Other keys (local
+    paths) are hashed under _local, which is not a valid GitHub owner.
+    
+    Args:
+        repo_key: Repository full name (owner/repo) or local path
+    
+    Returns:
+        Path of the statistics files without suffix
+    """
+    owner, _, repo = repo_key.partition("/")
+    if owner and repo and "/" not in repo:
+        return Config.STATS_DIR / owner / repo
+    return Config.STATS_DIR / "_local" / hashlib.sha256(repo_key.encode()).hexdigest()[:16]
+
+
+def _make_stats_dir(base: Path) -> None:
+    """Create the owner-only directory holding a repository's statistics files."""
+    Config.STATS_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    base.parent.mkdir(mode=0o700, exist_ok=True)
+
+
+def _line_cache_path(repo_key: str) -> Path:
+    """Get the cached line counts file of a repository."""
+    base = _stats_file_base(repo_key)
+    return base.with_name(f"{base.name}.lines.json")
+
+
+def _load_line_cache(repo_key: str) -> Dict[str, int]:
+    """Load a repository's cached line counts, keyed by git blob ID, from disk."""
+    try:
+        with open(_line_cache_path(repo_key), "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+
+def _save_line_cache(repo_key: str, line_cache: Dict[str, int]) -> None:
+    """Persist a repository's line counts, keyed by git blob ID, to disk."""
+    cache_file = _line_cache_path(repo_key)
+    try:
+        _make_stats_dir(cache_file)
+        # Write-then-rename so concurrent scans never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=f".{cache_file.name}-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(line_cache, f)
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        # The cache is an optimization; never fail a scan over it
+        pass
+
+
+def _stats_journal_path(repo_key: str) -> Path:
+    """Get the statistics journal file for a repository."""
+    base = _stats_file_base(repo_key)
+    return base.with_name(f"{base.name}.jsonl")
+
+
+def _load_stats_journal(journal_path: Path, head_sha: str) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild statistics from the journal of a completed walk.
+    
+    Args:
+        journal_path: Statistics journal file
+        head_sha: Commit SHA the journal must have been written for
+    
+    Returns:
+        Statistics dictionary, or None if the journal is missing, was written
+        for another commit or scanner version, or belongs to a walk that
+        never finished
+    """
+    file_types = Counter()
+    total_lines = 0
+    try:
+        with open(journal_path, "rb") as f:
+            if json.loads(f.readline()) != _journal_header(head_sha):
+                return None
+            for line in f:
+                record = json.loads(line)
+                if "path" not in record:
+                    # Trailer, written only once every file has been recorded
+                    if not record.get("complete"):
+                        return None
+                    return {
+                        "total_files": sum(file_types.values()),
+                        "total_lines": total_lines,
+                        "file_types": dict(file_types),
+                    }
+                file_types[record["ext"]] += 1
+                total_lines += record["lines"]
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def _journal_header(head_sha: Optional[str]) -> Dict[str, Any]:
+    """Header identifying the commit and scanner version a journal was written by."""
+    return {"head": head_sha, "scanner_version": SCANNER_VERSION}
+
+
+def _open_stats_journal(journal_path: Path, head_sha: Optional[str]) -> Optional[IO[str]]:
+    """
+    Start a new statistics journal in a private temporary file.
+    
+    The file only replaces journal_path once the walk completes (see
+    _close_stats_journal), so concurrent scans never write the same file.
+    
+    Args:
+        journal_path: Statistics journal file
+        head_sha: Commit SHA being walked, or None if unknown
+    
+    Returns:
+        Open journal file, or None if it cannot be written
+    """
+    try:
+        _make_stats_dir(journal_path)
+        # mkstemp creates the file 0600; it lists every path in the repository
+        fd, tmp_path = tempfile.mkstemp(dir=journal_path.parent, prefix=f".{journal_path.stem}-", suffix=".jsonl")
+        os.close(fd)
+        # Reopened by path so journal.name is the path to rename into place
+        journal = open(tmp_path, "w")
+    except OSError:
+        # The journal is an optimization; never fail a scan over it
+        return None
+    return _write_stats_journal(journal, _journal_header(head_sha))
+
+
+def _write_stats_journal(journal: IO[str], record: Dict[str, Any]) -> Optional[IO[str]]:
+    """
+    Append a record to a statistics journal, discarding the journal if it cannot be written.
+    
+    Args:
+        journal: Journal opened by _open_stats_journal
+        record: Record written as one JSON line
+    
+    Returns:
+        The journal, or None if writing failed (e.g. disk full) and it was discarded
+    """
+    try:
+        journal.write(json.dumps(record) + "\n")
+    except OSError:
+        for discard in (journal.close, partial(os.unlink, journal.name)):
+            try:
+                discard()
+            except OSError:
+                pass
+        return None
+    return journal
+
+
+def _close_stats_journal(journal: IO[str], journal_path: Path, complete: bool) -> None:
+    """
+    Finish a statistics journal.
+    
+    Args:
+        journal: Journal opened by _open_stats_journal
+        journal_path: Statistics journal file
+        complete: Whether the walk finished; otherwise the journal is discarded
+    """
+    try:
+        journal.close()
+    except OSError:
+        # The buffered tail could not be flushed; the journal is incomplete
+        complete = False
+    
+    try:
+        if complete:
+            os.replace(journal.name, journal_path)
+        else:
+            os.unlink(journal.name)
+    except OSError:
+        pass
+
+
+def _load_cached_mcp_report(cache_key: str) -> Optional[Any]:
+    """
+    Load a cached MCP agent report.
+    
+    Args:
+        cache_key: Commit SHA, scanner version and agent fingerprint
+    
+    Returns:
+        MCPReport, or None if not cached
+    """
+    cache_file = Config.MCP_CACHE_DIR / f"{cache_key}.json"
+    try:
+        data = cache_file.read_text()
+    except OSError:
+        return None
+    
+    from mcp_security_profiler.profile_agent import MCPReport
+    try:
+        return MCPReport.model_validate_json(data)
+    except ValueError:
+        return None
+
+
+def _save_cached_mcp_report(cache_key: str, mcp_report: Any) -> None:
+    """
+    Cache an MCP agent report.
+    
+    Args:
+        cache_key: Commit SHA, scanner version and agent fingerprint
+        mcp_report: MCPReport to cache
+    """
+    try:
+        Config.MCP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=Config.MCP_CACHE_DIR, prefix=".mcp-")
+        with os.fdopen(fd, "w") as f:
+            f.write(mcp_report.model_dump_json())
+        os.replace(tmp_path, Config.MCP_CACHE_DIR / f"{cache_key}.json")
+    except OSError:
+        # The cache is an optimization; never fail a scan over it
+        pass
+
+
+def _convert_vulnerabilities(vulnerabilities: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Convert MCP agent vulnerabilities to findings.
+    
+    Args:
+        vulnerabilities: MCPVulnerability objects from the agent report
+    
+    Returns:
+        List of findings, numbered MCP-001 onwards
+    """
+    return [
+        {
+            "id": f"MCP-{idx:03d}",
+            "title": vuln.name,
+            "description": vuln.description,
+            "severity": vuln.severity.lower(),
+            "category": "mcp_security_scan",
+            "recommendation": vuln.recommendation,
+            "confidence": vuln.confidence,
+            # Add file paths and code snippets if available, plus
+            # the first path as "file" for compatibility
+            **({
+                "affected_files": [
+                    {"path": path_info.path, "code_snippet": path_info.code_snippet}
+                    for path_info in vuln.paths
+                ],
+                "file": vuln.paths[0].path,
+            } if vuln.paths else {}),
+        }
+        for idx, vuln in enumerate(vulnerabilities, 1)
+    ]
+
+
+def _get_agent_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop the MCP agent runs on, starting it on first use.
+    
+    The loop runs forever in a daemon thread, so the MCP servers and HTTP
+    connections it holds are reused by every scan, including concurrent
+    ones; profile_agent shuts the servers down at exit.
+    
+    Returns:
+        Running event loop
+    """
+    global _agent_loop
+    with _agent_loop_lock:
+        if _agent_loop is None:
+            loop = (_LOOP_FACTORY or asyncio.new_event_loop)()
+            threading.Thread(target=loop.run_forever, name="mcp-agent-loop", daemon=True).start()
+            _agent_loop = loop
+    return _agent_loop
 
 
 async def _run_mcp_agent_wrapper(repo_path: str) -> Optional[Any]:
@@ -17,13 +596,7 @@ async def _run_mcp_agent_wrapper(repo_path: str) -> Optional[Any]:
         MCPReport or None if scan fails
     """
     from mcp_security_profiler.profile_agent import run_mcp_scan_agent
-    result = await run_mcp_scan_agent(repo_path)
-    
-    # Ensure all MCP subprocess operations complete
-    # Give time for uvx subprocesses to finish file operations
-    await asyncio.sleep(3)
-    
-    return result
+    return await run_mcp_scan_agent(repo_path)
 
 
 class Scanner:
@@ -41,48 +614,67 @@ class Scanner:
         self.repo_info = repo_info
         self.mcp_tools = []  # Store MCP tools separately
     
-    def scan(self) -> Dict[str, Any]:
+    @staticmethod
+    def warm_up() -> None:
+        """
+        Preload the MCP agent module so a later scan does not pay its import cost.
+        
+        Failures are ignored here; they are reported as findings by the scan.
+        """
+        try:
+            import mcp_security_profiler.profile_agent  # noqa: F401
+        except Exception:
+            pass
+    
+    def scan(self, force_rescan: bool = False) -> Dict[str, Any]:
         """
         Perform security scan on repository.
         
         This is a placeholder implementation. You can replace this with
         your custom scanning logic.
         
+        Args:
+            force_rescan: Run the MCP agent even if a cached result exists
+        
         Returns:
             Dictionary containing scan results
         """
         # Store start time to track scan duration
-        import time
         start_time = time.time()
         
+        scan_id = self._generate_scan_id()
+        timestamp = datetime.datetime.now().isoformat()
+        
+        # The MCP agent and the filesystem walk are independent; walk the
+        # repository in the background while the agent runs
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            statistics_future = executor.submit(self._gather_statistics)
+            findings = self._run_custom_scans(force_rescan)
+            statistics = statistics_future.result()
+        
+        severity_counts = Counter(finding.get("severity", "info").lower() for finding in findings)
+        
         scan_results = {
-            "scan_id": self._generate_scan_id(),
-            "timestamp": datetime.datetime.now().isoformat(),
+            "scan_id": scan_id,
+            "timestamp": timestamp,
             "repository": self.repo_info,
             "scan_metadata": {
-                "scanner_version": "0.1.0",
+                "scanner_version": SCANNER_VERSION,
                 "scan_type": "security_analysis",
             },
             "mcp_tools": self.mcp_tools,  # Add MCP tools section
-            "findings": self._run_custom_scans(),
-            "statistics": self._gather_statistics(),
+            "findings": findings,
+            "statistics": statistics,
             "summary": {
-                "total_findings": 0,
-                "critical": 0,
-                "high": 0,
-                "medium": 0,
-                "low": 0,
-                "info": 0,
+                "total_findings": len(findings),
+                "critical": severity_counts["critical"],
+                "high": severity_counts["high"],
+                "medium": severity_counts["medium"],
+                "low": severity_counts["low"],
+                "info": severity_counts["info"],
             }
         }
         
-        # Update summary based on findings
-        scan_results["summary"]["total_findings"] = len(scan_results["findings"])
-        for finding in scan_results["findings"]:
-            severity = finding.get("severity", "info").lower()
-            if severity in scan_results["summary"]:
-                scan_results["summary"][severity] += 1
-        
         # Add scan duration
         scan_results["scan_metadata"]["duration_seconds"] = round(time.time() - start_time, 2)
         
@@ -94,10 +686,13 @@ class Scanner:
         repo_name = self.repo_info.get("full_name", "unknown").replace("/", "-")
         return f"scan-{repo_name}-{timestamp}"
     
-    def _run_custom_scans(self) -> List[Dict[str, Any]]:
+    def _run_custom_scans(self, force_rescan: bool = False) -> List[Dict[str, Any]]:
         """
         Run custom security scans using MCP agent.
         
+        Args:
+            force_rescan: Run the MCP agent even if a cached result exists
+        
         Returns:
             List of findings
         """
@@ -105,35 +700,29 @@ class Scanner:
         
         # Run MCP security scan agent
         try:
-            # Run the async MCP scan with proper event loop handling
-            # Use the wrapper to ensure proper async context and subprocess completion
-            mcp_report = asyncio.run(_run_mcp_agent_wrapper(str(self.repo_path)))
+            from mcp_security_profiler.profile_agent import AGENT_FINGERPRINT
+            
+            # Reuse the agent's report for a commit already scanned by this
+            # version with the same model, instructions and report schema
+            head_sha = self._get_head_sha()
+            cache_key = f"{head_sha}-{SCANNER_VERSION}-{AGENT_FINGERPRINT}" if head_sha else None
+            mcp_report = None
+            if cache_key and not force_rescan:
+                mcp_report = _load_cached_mcp_report(cache_key)
+            
+            if mcp_report is None:
+                # Run the async MCP scan on the shared agent loop
+                mcp_report = asyncio.run_coroutine_threadsafe(
+                    _run_mcp_agent_wrapper(str(self.repo_path)),
+                    _get_agent_loop()
+                ).result()
+                # A tree with missing submodules must not stand in for the commit
+                if cache_key and mcp_report is not None and self._submodules_complete():
+                    _save_cached_mcp_report(cache_key, mcp_report)
             
             # Convert MCP vulnerabilities to findings format
             if mcp_report and mcp_report.vulnerabilities:
-                for idx, vuln in enumerate(mcp_report.vulnerabilities, 1):
-                    finding = {
-                        "id": f"MCP-{idx:03d}",
-                        "title": vuln.name,
-                        "description": vuln.description,
-                        "severity": vuln.severity.lower(),
-                        "category": "mcp_security_scan",
-                        "recommendation": vuln.recommendation,
-                        "confidence": vuln.confidence
-                    }
-                    
-                    # Add file paths and code snippets if available
-                    if vuln.paths:
-                        finding["affected_files"] = []
-                        for path_info in vuln.paths:
-                            finding["affected_files"].append({
-                                "path": path_info.path,
-                                "code_snippet": path_info.code_snippet
-                            })
-                        # Also add the first path as "file" for compatibility
-                        finding["file"] = vuln.paths[0].path
-                    
-                    findings.append(finding)
+                findings = _convert_vulnerabilities(mcp_report.vulnerabilities)
             
             # Store MCP tools separately (not as a finding)
             if mcp_report and mcp_report.tools:
@@ -143,9 +732,9 @@ class Scanner:
                 ]
         
         except Exception as e:
-            # If MCP scan fails, log it as a finding
-            import traceback
-            error_details = traceback.format_exc()
+            # If MCP scan fails, log it as a finding. Scan results stay plain
+            # JSON data, so the traceback is formatted here, once, from the
+            # exception already in hand
             findings.append({
                 "id": "MCP-ERROR-001",
                 "title": "MCP Security Scan Error",
@@ -153,7 +742,7 @@ class Scanner:
                 "severity": "info",
                 "category": "scan_error",
                 "recommendation": "Check MCP configuration and try again",
-                "error_traceback": error_details
+                "error_traceback": "".join(traceback.format_exception(e))
             })
         
         # Keep existing placeholder checks as fallback/additional checks
@@ -161,6 +750,78 @@ class Scanner:
         
         return findings
     
+    def _get_head_sha(self) -> Optional[str]:
+        """
+        Get the commit SHA checked out in the repository.
+        
+        Returns:
+            Commit SHA, or None if it cannot be determined
+        """
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.repo_path), "rev-parse", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return result.stdout.strip() or None
+    
+    def _submodules_complete(self) -> bool:
+        """
+        Check whether every submodule of the repository is checked out.
+        
+        A submodule that could not be fetched when cloning is left empty
+        and reported by git as not initialized.
+        
+        Returns:
+            True if all submodules are checked out (or there are none)
+        """
+        if not (self.repo_path / ".gitmodules").is_file():
+            return True
+        
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.repo_path), "submodule", "status", "--recursive"],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return False
+        # Lines of uninitialized submodules start with "-"
+        return not any(line.startswith("-") for line in result.stdout.splitlines())
+    
+    def _get_blob_ids(self) -> Dict[str, str]:
+        """
+        Get the git blob IDs of the files tracked in the repository.
+        
+        The working tree of a fresh clone matches its index, so a blob ID
+        identifies the content of the file on disk.
+        
+        Returns:
+            Blob IDs keyed by path relative to the repository root, or an
+            empty dict if the repository is not a git checkout
+        """
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.repo_path), "ls-files", "--stage", "-z"],
+                capture_output=True,
+                check=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return {}
+        
+        blob_ids = {}
+        # Records are "<mode> <blob id> <stage>\t<path>"
+        for record in result.stdout.split(b"\0"):
+            info, _, path = record.partition(b"\t")
+            mode, _, rest = info.partition(b" ")
+            if mode in (b"100644", b"100755"):
+                blob_ids[os.fsdecode(path).replace("/", os.sep)] = rest.partition(b" ")[0].decode()
+        return blob_ids
+    
     def _run_basic_checks(self) -> List[Dict[str, Any]]:
         """
         Run basic security checks.
@@ -170,19 +831,16 @@ class Scanner:
         """
         findings = []
         
+        # Inventory the repository root once instead of stat-ing each candidate
+        top = _list_dir(self.repo_path)
+        
         # Example: Check for common security files
-        security_files = [
-            "SECURITY.md",
-            ".github/SECURITY.md",
-            "security.txt",
-            ".well-known/security.txt"
-        ]
-        
-        has_security_policy = False
-        for sec_file in security_files:
-            if (self.repo_path / sec_file).exists():
-                has_security_policy = True
-                break
+        has_security_policy = (
+            "SECURITY.md" in top
+            or "security.txt" in top
+            or (".github" in top and "SECURITY.md" in _list_dir(self.repo_path / ".github"))
+            or (".well-known" in top and "security.txt" in _list_dir(self.repo_path / ".well-known"))
+        )
         
         if not has_security_policy:
             findings.append({
@@ -203,16 +861,16 @@ class Scanner:
             "Gemfile": "Ruby",
         }
         
-        for dep_file, ecosystem in dependency_files.items():
-            if (self.repo_path / dep_file).exists():
-                findings.append({
-                    "id": "INFO-001",
-                    "title": f"{ecosystem} Dependencies Detected",
-                    "description": f"Found {dep_file} - consider dependency scanning",
-                    "severity": "info",
-                    "category": "dependencies",
-                    "file": dep_file
-                })
+        detected = [(dep, eco) for dep, eco in dependency_files.items() if dep in top]
+        for idx, (dep_file, ecosystem) in enumerate(detected, 1):
+            findings.append({
+                "id": f"INFO-{idx:03d}",
+                "title": f"{ecosystem} Dependencies Detected",
+                "description": f"Found {dep_file} - consider dependency scanning",
+                "severity": "info",
+                "category": "dependencies",
+                "file": dep_file
+            })
         
         return findings
     
@@ -229,46 +887,65 @@ class Scanner:
             "file_types": {},
         }
         
+        # A finished walk of the same commit is replayed from its journal
+        repo_key = self.repo_info.get("full_name") or str(self.repo_path)
+        head_sha = self._get_head_sha()
+        journal_path = _stats_journal_path(repo_key)
+        if head_sha is not None:
+            journaled = _load_stats_journal(journal_path, head_sha)
+            if journaled is not None:
+                return journaled
+        
+        # Line counts are reused for any file content (git blob) seen in
+        # a previous scan of this repository, whichever commit it was in
+        blob_ids = self._get_blob_ids()
+        line_cache = _load_line_cache(repo_key) if blob_ids else {}
+        new_line_cache = {}
+        
+        # Per-file results are streamed to the journal as they arrive, so
+        # progress is visible on disk and an interrupted walk is detectable.
+        # A tree with missing submodules is not journaled, so the next scan
+        # of the commit walks the complete tree instead of replaying this one
+        journal = _open_stats_journal(journal_path, head_sha) if self._submodules_complete() else None
+        complete = False
         try:
-            for file_path in self.repo_path.rglob("*"):
-                if file_path.is_file() and not self._should_ignore(file_path):
-                    stats["total_files"] += 1
-                    
-                    # Count by extension
-                    ext = file_path.suffix or "no_extension"
-                    stats["file_types"][ext] = stats["file_types"].get(ext, 0) + 1
-                    
-                    # Count lines (for text files)
-                    try:
-                        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                            stats["total_lines"] += sum(1 for _ in f)
-                    except Exception:
-                        pass
+            count_file = partial(
+                _count_file,
+                root_len=len(str(self.repo_path)) + 1,
+                blob_ids=blob_ids,
+                line_cache=line_cache
+            )
+            
+            file_types = Counter()
+            total_lines = 0
+            
+            # Line counting is I/O-bound; threads overlap the open/read syscalls
+            with ThreadPoolExecutor(max_workers=STATS_MAX_WORKERS) as executor:
+                results = _map_bounded(executor, count_file, _walk_files(self.repo_path), STATS_MAX_PENDING)
+                for rel_path, ext, lines, blob_id in results:
+                    file_types[ext] += 1
+                    total_lines += lines
+                    if blob_id is not None:
+                        new_line_cache[blob_id] = lines
+                    if journal is not None:
+                        journal = _write_stats_journal(journal, {"path": rel_path, "ext": ext, "lines": lines})
+            
+            stats["total_files"] = sum(file_types.values())
+            stats["total_lines"] = total_lines
+            stats["file_types"] = dict(file_types)
+            if journal is not None:
+                journal = _write_stats_journal(journal, {"complete": True})
+            complete = True
         except Exception as e:
             stats["error"] = str(e)
+        finally:
+            if journal is not None:
+                _close_stats_journal(journal, journal_path, complete)
         
-        return stats
-    
-    def _should_ignore(self, path: Path) -> bool:
-        """
-        Check if path should be ignored.
-        
-        Args:
-            path: File path
+        # Only the current tree's blobs are kept, bounding the cache by repository
+        # size; a failed walk would drop the counts of files it never reached
+        if complete and new_line_cache != line_cache:
+            _save_line_cache(repo_key, new_line_cache)
         
-        Returns:
-            True if should be ignored
-        """
-        ignore_patterns = [
-            ".git",
-            "__pycache__",
-            "node_modules",
-            ".env",
-            "venv",
-            ".venv",
-            "dist",
-            "build",
-        ]
-        
-        return any(pattern in str(path) for pattern in ignore_patterns)
+        return stats
 